@@ -2,23 +2,30 @@ import base64
 import json
 from pathlib import Path
 from type import *
-import io, os, sys, re, pdfkit, pyperclip, msoffcrypto, gc, traceback # type: ignore
+import io, os, sys, re, time, hashlib, hmac, datetime as dt, pdfkit, pyperclip, msoffcrypto, openpyxl, gc, traceback # type: ignore
 import customtkinter as ctk # type: ignore
 import tkinter as tk # type: ignore
 import pandas as pd # type: ignore
+import numpy as np
 from mail import Mailing, AsyncMailing, AsyncMessage, MIMEMultipart
 from logger import Logger
-from threading import Thread, excepthook
+from threading import Thread, RLock, excepthook
 import tkinter.messagebox as tkmb
 from default import SVG_ICON, TEMPLATE
-from multiprocessing import Process, Queue, freeze_support
+from multiprocessing import Process, Queue, freeze_support, shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tkinter import filedialog, scrolledtext, Scrollbar, messagebox 
-from database import dataRefine, Database, mapping, CreateTable, UpdateTable, DeleteTable
+from database import dataRefine, Database, mapping, ColumnIndex, CreateTable, UpdateTable, DeleteTable
 from PIL import Image, ImageTk
 import pdfkit
-from parser import PDFTemplate
-from asyncio import gather, run, to_thread
+from parser import PDFTemplate, install_key
+from pdfwriter import OverlayTemplate, SlipWriter, text_width
+from asyncio import gather, run, to_thread, create_task, Queue as AsyncQueue
 from copy import deepcopy
+from collections.abc import Mapping
+from collections import OrderedDict
+from cryptography.fernet import Fernet # type: ignore
+import pickle
 from creds import PROD_CREDS, TEST_CREDS, DB_CREDS
 
 IS_EXE = True
@@ -74,8 +81,9 @@ def file_clean(x: str):
 
 def checkColumns(present_col: list[str], needed_col: list[str]) -> bool:
     seen = set()
+    index = ColumnIndex(needed_col)
     for i in present_col:
-        if (mapping(needed_col, i) is not None):
+        if (index.find(i) is not None):
             seen.add(i)
     return len(needed_col) == len(seen)
 
@@ -95,6 +103,9 @@ class BaseTemplate():
     process: Process | None = None
     """ All frames will have 1 common process to run big task """
     
+    shards: list[Process] = []
+    """ Processes sharing one big task between cores, used instead of process """
+    
     thread: Thread | None = None
     """ All frames gets 1 common thread to process gui changes """
     
@@ -107,6 +118,9 @@ class BaseTemplate():
     data: pd.DataFrame | dict[str, pd.DataFrame] | None = None
     """ A shared data storage """
     
+    rows: int = 0
+    """ Rows of the sheet last loaded, the row buttons read it instead of the sheet """
+    
     def __init__(self, outer: 'App') -> None:
         self.outer = outer
         self.visible: bool = False
@@ -142,6 +156,9 @@ class BaseTemplate():
         if(self.process and self.process.is_alive()):
             self.process.terminate()
             
+        for shard in self.shards:
+            if(shard.is_alive()): shard.terminate()
+            
         self.clear_queue()
 
             
@@ -149,6 +166,7 @@ class BaseTemplate():
         """ Check if threading can begin """
         
         can_we_start = bool((self.process is None) or (self.process and (not self.process.is_alive())) and ((self.thread is None) or (self.thread and (not self.thread.is_alive()))))
+        can_we_start = can_we_start and not any(shard.is_alive() for shard in self.shards)
         
         if(can_we_start): self.stop_flag = False
         
@@ -172,10 +190,51 @@ class BaseTemplate():
         """ Clear the queue """
         while not self.QUEUE.empty(): self.QUEUE.get()
     
+    def load_sheets(self, sheets: list[str], data: Optional[Mapping[str, pd.DataFrame]] = None) -> Optional[dict[str, pd.DataFrame]]:
+        """ Frames of sheets of data (the shared data by default), called from a gui worker thread. Sheets not parsed yet are parsed in a process """
+        
+        data = BaseTemplate.data if data is None else data
+        
+        if(data is None): return None
+        
+        if(isinstance(data, (Workbook, Ledger)) and (pending := [sheet for sheet in sheets if not data.ready(sheet)])):
+            self.process = Process(target=Decryption.fetch_sheets,kwargs={'queue': self.QUEUE,'data': data.detach(pending),'sheets': pending},daemon=True)
+            self.process.start()
+            
+            parsed: list[tuple[str, pd.DataFrame, pd.DataFrame]] = []
+            
+            while True:
+                
+                if(self.stop_flag): return None
+                
+                if(not self.QUEUE.empty()):
+                    parsed = self.QUEUE.get()
+                    self.clear_queue()
+                    break
+            
+            if(len(parsed) != len(pending)): return None
+            
+            frames = {sheet: frame for sheet, _, frame in parsed}
+            
+            for sheet, grid, frame in parsed: data.adopt(sheet, grid, frame)
+        else:
+            frames = {}
+        
+        frames = {sheet: frames[sheet] if sheet in frames else data[sheet] for sheet in sheets}
+        
+        if(sheets): self.rows = frames[sheets[-1]].shape[0]
+        
+        return frames
+    
+    def load_sheet(self, sheet: str) -> Optional[pd.DataFrame]:
+        return None if (frames := self.load_sheets([sheet])) is None else frames[sheet]
+    
     def clear_data(self, hard = True):
         """ Clear Shared Data """
         
-        if(hard): BaseTemplate.data = None
+        if(hard): 
+            BaseTemplate.data = None
+            SharedFrame.clear()
         erased = gc.collect()
         ERROR_LOG.write_info(f"{erased} Variables Cleared")
     
@@ -243,6 +302,8 @@ class App:
         
     def exit_app(self):
         try:
+            DecryptionCache.clear()
+            SharedFrame.clear()
             self.APP.destroy()
         except Exception as e:
             ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
@@ -263,22 +324,180 @@ class App:
 class PDFGenerator:
     """ Class to handle everything related to PDF Generation """
     
+    POOL_SIZE: int = os.cpu_count() or 4
+    """ wkhtmltopdf renders running at the same time during bulk print, split between the shards. weasyprint renders one slip at a time in each shard process, which keeps its fonts and parsed styles from slip to slip """
+    
+    CONFIG: Any = None
+    """ wkhtmltopdf configuration, resolved once and reused by every render """
+    
+    BATCH_SIZE: int = 1
+    """ Slips laid out together in one render during bulk print (1 renders each slip on its own), more than 1 needs weasyprint """
+    
+    ZOOM: float = 0.85
+    """ wkhtmltopdf shrinks the 800px slip to fit A4, weasyprint renders are zoomed by the same amount """
+    
+    OPTIONS: dict[str, NullStr] = {
+        'page-size': 'A4',
+        'margin-top': '0.5in',
+        'margin-right': '0.5in',
+        'margin-bottom': '0.5in',
+        'margin-left': '0.5in',
+        'no-outline': None
+    }
+    """ wkhtmltopdf options for every slip """
+    
+    CACHE_DIR: str = ".cache"
+    """ Folder next to the pdfs holding the fingerprint of the html each pdf was made from """
+    
+    BACKENDS: tuple[str, ...] = ('wkhtmltopdf', 'weasyprint', 'overlay', 'native')
+    """ Engines a slip can be rendered with, overlay lays out once and only redraws the values per slip, native draws generated templates without html """
+    
+    backend: str = 'wkhtmltopdf'
+    """ Engine used by this process, one of BACKENDS """
+    
+    STYLE_REGEX = r'<style[^>]*>(.*?)</style>'
+    
+    STYLES: dict[str, Any] = {}
+    """ Template stylesheets parsed once by weasyprint, keyed on the css text """
+    
+    FONTS: Any = None
+    """ weasyprint font configuration shared by every render """
+    
+    WEASY_LOCK = RLock()
+    """ weasyprint layout is pure python and not thread safe, renderers take turns """
+    
+    @staticmethod
+    def _configuration() -> Any:
+        """ Finds wkhtmltopdf only on first use instead of once per pdf """
+        
+        if(PDFGenerator.CONFIG is None):
+            PDFGenerator.CONFIG = pdfkit.configuration()
+            
+        return PDFGenerator.CONFIG
+    
     @staticmethod
     def _generate_pdf(pdf_file_path:Path, html_content:str) -> None:
         """ Generates the pdf from html """
+        
+        if(PDFGenerator.backend in ('weasyprint', 'overlay')):
+            with PDFGenerator.WEASY_LOCK:
+                PDFGenerator._weasy_document(html_content).write_pdf(str(pdf_file_path), zoom=PDFGenerator.ZOOM)
+            return
 
         pdfkit.from_string(
             html_content, 
             str(pdf_file_path),
-            options={
-                'page-size': 'A4',
-                'margin-top': '0.5in',
-                'margin-right': '0.5in',
-                'margin-bottom': '0.5in',
-                'margin-left': '0.5in',
-                'no-outline': None
-            }
+            configuration=PDFGenerator._configuration(),
+            options=PDFGenerator.OPTIONS
         )
+        
+    @staticmethod
+    def _render_pdf(html_content:str) -> bytes:
+        """ Renders the pdf in memory without touching the disk """
+        
+        if(PDFGenerator.backend in ('weasyprint', 'overlay')):
+            with PDFGenerator.WEASY_LOCK:
+                return PDFGenerator._weasy_document(html_content).write_pdf(zoom=PDFGenerator.ZOOM)
+        
+        return pdfkit.from_string(html_content, False, configuration=PDFGenerator._configuration(), options=PDFGenerator.OPTIONS)
+        
+    @staticmethod
+    def _fingerprint(html_content: str, backend: NullStr = None) -> str:
+        """ Hash of the slip html and every render option that changes the pdf """
+        
+        options = json.dumps([backend or PDFGenerator.backend, PDFGenerator.ZOOM, PDFGenerator.OPTIONS], sort_keys=True)
+        return hashlib.sha256(f"{options}\n{html_content}".encode()).hexdigest()
+    
+    @staticmethod
+    def _stamp(pdf_file: Path) -> Path:
+        """ Where the fingerprint of a pdf is kept """
+        return pdf_file.parent.joinpath(PDFGenerator.CACHE_DIR, f"{pdf_file.name}.sha256")
+    
+    @staticmethod
+    def is_cached(pdf_file: Path, fingerprint: str) -> bool:
+        """ Checks if the pdf was already made from the same html and options """
+        
+        try:
+            stamp = PDFGenerator._stamp(pdf_file)
+            return pdf_file.exists() and stamp.exists() and stamp.read_text() == fingerprint
+        except OSError:
+            return False
+        
+    @staticmethod
+    def forget(pdf_file: Path) -> None:
+        """ Drops the fingerprint before a pdf is overwritten, so a failed render is never cached """
+        PDFGenerator._stamp(pdf_file).unlink(missing_ok=True)
+    
+    @staticmethod
+    def remember(pdf_file: Path, fingerprint: str) -> None:
+        """ Stores the fingerprint of a freshly rendered pdf """
+        
+        try:
+            stamp = PDFGenerator._stamp(pdf_file)
+            stamp.parent.mkdir(exist_ok=True)
+            stamp.write_text(fingerprint)
+        except OSError as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+
+    @staticmethod
+    def _page_css() -> str:
+        """ A4 page with 0.5in margins, enlarged so it is A4 again after zooming """
+        
+        zoom = PDFGenerator.ZOOM
+        return f"@page {{ size: {210/zoom:.2f}mm {297/zoom:.2f}mm; margin: {0.5/zoom:.3f}in; }}"
+    
+    @staticmethod
+    def _join_slips(html_contents: list[str]) -> str:
+        """ Joins slips into one document, every slip starting on a new page """
+        
+        head = re.search(r'<head[^>]*>(.*?)</head>', html_contents[0], re.S | re.I)
+        slips: list[str] = []
+        
+        for idx, html_content in enumerate(html_contents):
+            body = re.search(r'<body[^>]*>(.*)</body>', html_content, re.S | re.I)
+            page_break = ' style="break-before: page"' if idx else ''
+            slips.append(f'<div id="__slip_{idx}__"{page_break}>{body.group(1) if body else html_content}</div>')
+            
+        return f"<!DOCTYPE html><html><head>{head.group(1) if head else ''}</head><body>{''.join(slips)}</body></html>"
+    
+    @staticmethod
+    def _weasy_document(html_content: str) -> Any:
+        """ Lays out html with weasyprint, reusing the parsed <style> block and loaded fonts """
+        
+        # imported here, weasyprint needs GTK which is not installed everywhere wkhtmltopdf is
+        from weasyprint import HTML, CSS # type: ignore
+        from weasyprint.text.fonts import FontConfiguration # type: ignore
+        
+        if(PDFGenerator.FONTS is None):
+            PDFGenerator.FONTS = FontConfiguration()
+        
+        css_text = "\n".join(re.findall(PDFGenerator.STYLE_REGEX, html_content, re.S | re.I))
+        
+        if((stylesheet := PDFGenerator.STYLES.get(css_text)) is None):
+            stylesheet = CSS(string=PDFGenerator._page_css() + css_text, font_config=PDFGenerator.FONTS)
+            PDFGenerator.STYLES[css_text] = stylesheet
+        
+        body = re.sub(PDFGenerator.STYLE_REGEX, "", html_content, flags=re.S | re.I)
+        
+        return HTML(string=body).render(stylesheets=[stylesheet], font_config=PDFGenerator.FONTS)
+    
+    @staticmethod
+    def _generate_batch(pdf_file_paths: list[Path], html_contents: list[str]) -> None:
+        """ Lays out many slips in one render and splits the pages back into one pdf per slip """
+        
+        # wkhtmltopdf output cannot be split again, weasyprint keeps the laid out pages around
+        with PDFGenerator.WEASY_LOCK:
+            document = PDFGenerator._weasy_document(PDFGenerator._join_slips(html_contents))
+            starts: dict[str, int] = {}
+            
+            for idx, page in enumerate(document.pages):
+                for anchor in page.anchors:
+                    starts.setdefault(anchor, idx)
+            
+            bounds = [starts[f"__slip_{idx}__"] for idx in range(len(pdf_file_paths))] + [len(document.pages)]
+            
+            for idx, pdf_file in enumerate(pdf_file_paths):
+                document.copy(document.pages[bounds[idx]:bounds[idx+1]]).write_pdf(str(pdf_file), zoom=PDFGenerator.ZOOM)
 
     @staticmethod
     def generate_one_pdf(name: str, html_content:str, file_path:Path) -> tuple[bool,str]:
@@ -311,7 +530,14 @@ class PDFGenerator:
             filename = f"employee_{file_clean(name)}.pdf"
             if (re.match(FILE_REGEX,filename)):
                 pdf_file = where.joinpath(filename)
+                fingerprint = PDFGenerator._fingerprint(html_content)
+                
+                if(PDFGenerator.is_cached(pdf_file, fingerprint)):
+                    return (True,"PDF Generation Skipped, slip is unchanged")
+                
+                PDFGenerator.forget(pdf_file)
                 await to_thread(PDFGenerator._generate_pdf, pdf_file, html_content)
+                PDFGenerator.remember(pdf_file, fingerprint)
                 return (True,"PDF Generation Successful")
             else:
                 ERROR_LOG.write_info(f"{filename} does not match pattern '{FILE_REGEX}'")
@@ -320,14 +546,336 @@ class PDFGenerator:
         except Exception as e:
             ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
             return (False,f"An error occurred while generating the PDF: {str(e)}")
+        
+    @staticmethod
+    async def generate_pdf_bytes(name: str, html_content:str, where: Optional[Path] = None) -> tuple[bool,str,bytes]:
+        """ Wrapper Function to render a pdf in memory, a copy is kept in where if given """
+        
+        try:
+            filename = f"employee_{file_clean(name)}.pdf"
+            if (not re.match(FILE_REGEX,filename)):
+                ERROR_LOG.write_info(f"{filename} does not match pattern '{FILE_REGEX}'")
+                return (False,f"{filename} does not match pattern '{FILE_REGEX}'",b"")
+            
+            fingerprint = PDFGenerator._fingerprint(html_content)
+            pdf_file = where.joinpath(filename) if where is not None else None
+            
+            if(pdf_file is not None and PDFGenerator.is_cached(pdf_file, fingerprint)):
+                return (True,"PDF Generation Skipped, slip is unchanged",await to_thread(pdf_file.read_bytes))
+            
+            pdf = await to_thread(PDFGenerator._render_pdf, html_content)
+            
+            if(pdf_file is not None):
+                PDFGenerator.forget(pdf_file)
+                await to_thread(pdf_file.write_bytes, pdf)
+                PDFGenerator.remember(pdf_file, fingerprint)
+                
+            return (True,"PDF Generation Successful",pdf)
+                
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            return (False,f"An error occurred while generating the PDF: {str(e)}",b"")
+        
+    @staticmethod
+    def _stencil(template_html: str, sample: dict[str, str]) -> OverlayTemplate:
+        """ Lays the template out once around sample values and keeps it as a skeleton pdf """
+        
+        marked_html, keys = OverlayTemplate.mark(template_html, PDFTemplate.TEMPLATE, sample)
+        
+        with PDFGenerator.WEASY_LOCK:
+            return OverlayTemplate(PDFGenerator._weasy_document(marked_html), keys, PDFGenerator.ZOOM)
+    
+    @staticmethod
+    def stencil_many_pdf(template_html: str, slips: Iterable[dict[str, str]], where:Path, manifest: Optional['Manifest'] = None, progress: Optional['Progress'] = None, stencil: Optional[OverlayTemplate | SlipWriter] = None, sample: Optional[dict[str, str]] = None) -> tuple[int,int]:
+        """ Renders the skeleton of the template once around sample (the first slip if not given), then only draws the values of every employee on it """
+        
+        success, total = 0, 0
+        
+        for emp_data in slips:
+            name = emp_data.get(CODE_COL,"none")
+            status = False
+            
+            # the skeleton is part of every slip, so a pdf laid out around another sample is not reused
+            if(stencil is None and sample is None): sample = emp_data
+            
+            try:
+                filename = f"employee_{file_clean(name)}.pdf"
+                
+                if (re.match(FILE_REGEX,filename)):
+                    pdf_file = where.joinpath(filename)
+                    fingerprint = PDFGenerator._fingerprint(template_html + json.dumps(emp_data, sort_keys=True) + ("" if sample is None else json.dumps(sample, sort_keys=True)))
+                    
+                    if(not PDFGenerator.is_cached(pdf_file, fingerprint)):
+                        if(stencil is None):
+                            try:
+                                stencil = PDFGenerator._stencil(template_html, sample or emp_data)
+                            except Exception as e:
+                                ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+                                break
+                        
+                        PDFGenerator.forget(pdf_file)
+                        pdf_file.write_bytes(stencil.render(emp_data))
+                        PDFGenerator.remember(pdf_file, fingerprint)
+                    
+                    status = True
+                    if(manifest is not None): manifest.record(name, pdf_file)
+                else:
+                    ERROR_LOG.write_info(f"{filename} does not match pattern '{FILE_REGEX}'")
+                    
+            except Exception as e:
+                ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            
+            if(status): success += 1
+            total += 1
+            if(progress is not None): progress.update(status)
+                
+        return success, total
+        
+    @staticmethod
+    async def generate_batch_pdf(jobs: list[tuple[str, str]], where:Path) -> list[tuple[bool,str]]:
+        """ Wrapper Function to generate a batch of pdfs with one render """
+        
+        results: list[tuple[bool,str]] = [(False, "")] * len(jobs)
+        pdf_files: list[Path] = []
+        html_contents: list[str] = []
+        fingerprints: list[str] = []
+        pending: list[int] = []
+        
+        for idx, (name, html_content) in enumerate(jobs):
+            filename = f"employee_{file_clean(name)}.pdf"
+            
+            if (re.match(FILE_REGEX,filename)):
+                pdf_file = where.joinpath(filename)
+                fingerprint = PDFGenerator._fingerprint(html_content, 'weasyprint')
+                
+                if(PDFGenerator.is_cached(pdf_file, fingerprint)):
+                    results[idx] = (True,"PDF Generation Skipped, slip is unchanged")
+                    continue
+                
+                PDFGenerator.forget(pdf_file)
+                pdf_files.append(pdf_file)
+                html_contents.append(html_content)
+                fingerprints.append(fingerprint)
+                pending.append(idx)
+            else:
+                ERROR_LOG.write_info(f"{filename} does not match pattern '{FILE_REGEX}'")
+                results[idx] = (False,f"{filename} does not match pattern '{FILE_REGEX}'")
+        
+        if(not pending): return results
+        
+        try:
+            await to_thread(PDFGenerator._generate_batch, pdf_files, html_contents)
+            
+            for idx, pdf_file, fingerprint in zip(pending, pdf_files, fingerprints):
+                PDFGenerator.remember(pdf_file, fingerprint)
+                results[idx] = (True,"PDF Generation Successful")
+                
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            
+            # one bad slip should not fail the whole batch, retry them one by one
+            for idx in pending:
+                name, html_content = jobs[idx]
+                results[idx] = await PDFGenerator.generate_many_pdf(name, html_content, where)
+                
+        return results
+        
+    @staticmethod
+    async def feed(jobs: Iterable[Any], worker: Callable[[Any], Any], size: int) -> None:
+        """ Hands jobs through a bounded work queue to a fixed number of concurrent workers """
+        
+        work: AsyncQueue[Any] = AsyncQueue(maxsize=size*2)
+        
+        async def consumer() -> None:
+            while (job := await work.get()) is not None:
+                await worker(job)
+        
+        consumers = [create_task(consumer()) for _ in range(size)]
+        
+        for job in jobs:
+            await work.put(job)
+            
+        for _ in consumers:
+            await work.put(None)
+            
+        await gather(*consumers)
+    
+    @staticmethod
+    def _chunks(jobs: Iterable[tuple[str, str]], size: int) -> Generator[list[tuple[str, str]], None, None]:
+        """ Groups jobs lazily into lists of at most size """
+        
+        chunk: list[tuple[str, str]] = []
+        
+        for job in jobs:
+            chunk.append(job)
+            
+            if(len(chunk) == size):
+                yield chunk
+                chunk = []
+        
+        if(chunk): yield chunk
+        
+    @staticmethod
+    async def render_pool(jobs: Iterable[tuple[str, str]], where:Path, pool_size: Optional[int] = None, batch_size: Optional[int] = None, manifest: Optional['Manifest'] = None, progress: Optional['Progress'] = None) -> tuple[int,int]:
+        """ Feeds (name, html) jobs through a bounded work queue. At most pool_size wkhtmltopdf renders run at once, each one still a process of its own """
+        
+        # weasyprint renders take WEASY_LOCK, more consumers would only wait on each other
+        size = 1 if PDFGenerator.backend == 'weasyprint' else max(1, pool_size or PDFGenerator.POOL_SIZE)
+        batch = max(1, batch_size or PDFGenerator.BATCH_SIZE)
+        success, total = 0, 0
+        
+        if(batch > 1 and PDFGenerator.backend != 'weasyprint'):
+            raise ValueError(f"Batches of {batch} slips need weasyprint, '{PDFGenerator.backend}' output cannot be split back into slips")
+        
+        async def renderer(chunk: list[tuple[str, str]]) -> None:
+            nonlocal success, total
+            
+            if(batch == 1):
+                name, html_content = chunk[0]
+                results = [await PDFGenerator.generate_many_pdf(name, html_content, where)]
+            else:
+                results = await PDFGenerator.generate_batch_pdf(chunk, where)
+            
+            for (name, _), (status, _) in zip(chunk, results):
+                if(status): 
+                    success += 1
+                    if(manifest is not None): manifest.record(name, where.joinpath(f"employee_{file_clean(name)}.pdf"))
+                total += 1
+                if(progress is not None): progress.update(bool(status))
+        
+        await PDFGenerator.feed(PDFGenerator._chunks(jobs, batch), renderer, size)
+        
+        return success, total
+
+class Manifest:
+    """ Record of the slips a bulk print run has finished, kept next to the pdfs """
+    
+    PATTERN: str = "manifest_*.jsonl"
+    
+    def __init__(self, dropzone: Path, shard: int = 0) -> None:
+        self.path = dropzone.joinpath(f"manifest_{shard}.jsonl")
+    
+    @staticmethod
+    def checksum(pdf_file: Path) -> str:
+        """ sha256 of a finished pdf """
+        return hashlib.sha256(pdf_file.read_bytes()).hexdigest()
+    
+    @staticmethod
+    def reset(dropzone: Path) -> None:
+        """ Forgets every previous run before a fresh one starts """
+        
+        for manifest in dropzone.glob(Manifest.PATTERN):
+            manifest.unlink(missing_ok=True)
+    
+    @staticmethod
+    def finished(dropzone: Path, ids: Optional[set[str]] = None) -> set[str]:
+        """ Employee codes whose pdf still exists and matches the recorded checksum, only codes in ids are checked if given """
+        
+        done: set[str] = set()
+        
+        for manifest in dropzone.glob(Manifest.PATTERN):
+            try:
+                for line in manifest.read_text().splitlines():
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue # last line of a killed run may be cut short
+                    
+                    if(ids is not None and entry["id"] not in ids): continue
+                    
+                    pdf_file = Path(entry["path"])
+                    
+                    if(pdf_file.exists() and Manifest.checksum(pdf_file) == entry["sha256"]):
+                        done.add(entry["id"])
+                        
+            except Exception as e:
+                ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+                
+        return done
+    
+    def record(self, emp_id: str, pdf_file: Path) -> None:
+        """ Appends a finished slip, one line each so a killed run keeps everything before it """
+        
+        try:
+            entry = {"id": emp_id, "path": str(pdf_file), "sha256": Manifest.checksum(pdf_file)}
+            
+            with open(self.path, "a") as file:
+                file.write(json.dumps(entry) + "\n")
+                
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+
+class Progress:
+    """ Progress of a bulk job, put on the queue as PROGRESS events at a bounded rate """
+    
+    INTERVAL: float = 0.5
+    """ Least seconds between two events """
+    
+    def __init__(self, queue: Queue, total: int, shard: int = 0) -> None:
+        self.queue = queue
+        self.total = total
+        self.shard = shard
+        self.completed = 0
+        self.failed = 0
+        self.rendered = 0
+        self.started = self.last = time.monotonic()
+        
+    def skip(self, count: int = 1) -> None:
+        """ Counts work finished by an earlier run, it does not add to the rate """
+        self.completed += count
+        
+    def update(self, status: bool) -> None:
+        """ Counts one finished task and emits an event if enough time has passed """
+        
+        if(status): self.completed += 1
+        else: self.failed += 1
+        self.rendered += 1
+        
+        if(time.monotonic() - self.last >= self.INTERVAL): self.emit()
+        
+    def emit(self) -> None:
+        """ Puts the current progress on the queue """
+        
+        self.last = time.monotonic()
+        rate = self.rendered / max(self.last - self.started, 1e-6)
+        remaining = self.total - self.completed - self.failed
+        
+        self.queue.put(PROGRESS(
+            shard=self.shard,
+            completed=self.completed,
+            failed=self.failed,
+            total=self.total,
+            rate=rate,
+            eta=(remaining / rate) if rate else -1.0
+        ))
+        
+    @staticmethod
+    def describe(events: Iterable[PROGRESS], idle: float = 0) -> str:
+        """ One line summary of the latest event from every shard """
+        
+        events = list(events)
+        completed = sum(i["completed"] for i in events)
+        failed = sum(i["failed"] for i in events)
+        total = sum(i["total"] for i in events)
+        rate = sum(i["rate"] for i in events)
+        eta = max([i["eta"] for i in events] or [-1.0])
+        
+        text = f"{completed}/{total} done, {failed} failed, {rate:.1f} slips/s"
+        if(eta >= 0): text += f", ETA {int(eta // 60)}m {int(eta % 60)}s"
+        if(idle >= 10): text += f" (no progress for {int(idle)}s)"
+        
+        return text
 
 class GUI_Handler:
     """ Handles GUI """
     
     @staticmethod
-    def view_excel(data: pd.DataFrame, text_excel:scrolledtext.ScrolledText) -> None:
-        """ Changes the text on the text excel thing  """
+    def view_excel(data: Optional[pd.DataFrame], text_excel:scrolledtext.ScrolledText) -> None:
+        """ Changes the text on the text excel thing, None (a sheet that could not be loaded) leaves it as it is """
+        
+        if(data is None): return
         
+        data = Schema.text(data)
         text = [[str(i) for i in data.columns]]
         col_widths = {i:len(str(j)) for i,j in enumerate(data.columns)}
         
@@ -422,69 +970,564 @@ class GUI_Handler:
         """ Clears entry widget """
         widget.delete(0, tk.END)
 
-class Decryption:
-    """ Handles file decryption  """
+class Schema:
+    """ Kind of every column of a loaded sheet, worked out once so the frame is held compactly and turned back into text only when shown """
     
+    CATEGORY_SHARE: float = 0.5
+    """ Text and identifier columns with less than this share of distinct values are held as categories """
     
-    @staticmethod
-    def is_encrypted(file:io.BufferedReader) -> bool:
-        """ Checks if file is encrypted """
-        return msoffcrypto.OfficeFile(file).is_encrypted()
+    IDENTIFIERS: set[str] = {"code", "id", "no", "number", "name", "email", "mail", "pan", "account", "ifsc", "uan", "aadhar", "aadhaar", "mobile", "phone"}
+    """ Words in a column name marking it as an identifier, never read as an amount or a date even when it looks like one """
+    
+    AMOUNT: re.Pattern[str] = re.compile(r"^-?(0|[1-9]\d{0,14})(\.\d+)?$")
+    """ Numbers without leading zeros, anything else (account numbers, pin codes) stays text """
+    
+    DATE: re.Pattern[str] = re.compile(r"^\d{4}-\d{2}-\d{2}( \d{2}:\d{2}:\d{2})?$")
+    
+    def __init__(self, kinds: dict[Any, str]) -> None:
+        self.kinds = kinds
+        """ category, amount, date or text for each column """
     
     @staticmethod
-    def decrypting_file(file_path:Path, decrypted:io.BytesIO, password:str) -> tuple[bool, io.BytesIO]:
-        """ Decrypts the file and extracts content into BytesIO """
+    def kind(name: Any, column: pd.Series) -> str:
         
-        success = False
-        try:
-            with open(file_path.resolve(), "rb") as f:
-                file = msoffcrypto.OfficeFile(f)
-                file.load_key(password=password)  
-                file.decrypt(decrypted)
-                success = True
-                
-        except msoffcrypto.exceptions.InvalidKeyError as e:
-            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
-
-        except msoffcrypto.exceptions.DecryptionError as e:
-            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+        if(pd.api.types.is_datetime64_any_dtype(column.dtype)): return "date"
+        if(pd.api.types.is_bool_dtype(column.dtype)): return "text"
+        
+        identifier = bool(set(re.split(r"[^a-z0-9]+", str(name).casefold())) & Schema.IDENTIFIERS)
+        
+        if(not identifier and pd.api.types.is_numeric_dtype(column.dtype)): return "amount"
+        
+        cells = column.dropna()
+        
+        if(cells.empty): return "text"
+        
+        if(not identifier):
+            if(all(isinstance(cell, (pd.Timestamp, np.datetime64, dt.datetime)) for cell in cells)): return "date"
             
-        except Exception as e:
-            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            text = cells.astype(str).str.strip()
             
-        return (success, decrypted)
+            if(text.str.fullmatch(Schema.AMOUNT).all()): return "amount"
+            if(text.str.fullmatch(Schema.DATE).all()): return "date"
+        
+        if(cells.nunique() < Schema.CATEGORY_SHARE * cells.shape[0]): return "category"
+        
+        return "text"
     
     @staticmethod
-    def is_encrypted_wrapper(queue: Queue, file_path:Path) -> None:
-        """ Wrapper for is_encrypted  """
-        result = None
-
-        try:
-            if(file_path.exists()):
-                with open(file_path.resolve(), 'rb') as f:
-                    result = Decryption.is_encrypted(f)
-                    
-        except Exception as e:
-            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
-            result = None
+    def classify(frame: pd.DataFrame) -> "Schema":
+        return Schema({name: Schema.kind(name, frame.iloc[:, i]) for i, name in enumerate(frame.columns)})
+    
+    @staticmethod
+    def _amount(column: pd.Series) -> pd.Series:
+        """ Whole amounts become the smallest integer type that holds them, the rest stay float64 so no digit changes """
+        
+        numbers = pd.to_numeric(column, errors="coerce") if not pd.api.types.is_numeric_dtype(column.dtype) else column
+        
+        if(numbers.isna().sum() > column.isna().sum()): return column
+        
+        cells = numbers.dropna()
+        
+        if(not cells.empty and not (cells % 1 == 0).all()): return numbers.astype(np.float64)
+        
+        smallest = pd.to_numeric(cells.astype(np.int64), downcast="integer").dtype if not cells.empty else np.dtype(np.int8)
+        
+        return numbers.astype(smallest) if cells.shape[0] == numbers.shape[0] else numbers.astype(smallest.name.capitalize())
+    
+    @staticmethod
+    def lossless(column: pd.Series, converted: pd.Series) -> bool:
+        """ Whether converted shows every cell of column as the same text and loses no cell """
+        
+        present = column.notna().to_numpy()
+        
+        if((converted.notna().to_numpy() != present).any()): return False
+        
+        return bool((Schema.display(converted).to_numpy()[present] == Schema.display(column).to_numpy()[present]).all())
+    
+    def compact(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """ Copy of frame with every column converted to its kind, a column that would not read back the same stays as it is """
+        
+        columns: dict[int, pd.Series] = {}
+        
+        for i, name in enumerate(frame.columns):
+            column = frame.iloc[:, i]
+            
+            kind = self.kinds.get(name, "text")
+            
+            converted = column
+            
+            try:
+                if(kind == "category" and not isinstance(column.dtype, pd.CategoricalDtype)):
+                    converted = Schema.display(column).where(column.notna()).astype("category")
+                elif(kind == "amount"):
+                    converted = Schema._amount(column)
+                elif(kind == "date" and pd.api.types.is_string_dtype(column.dtype)):
+                    converted = pd.to_datetime(column, errors="coerce", format="ISO8601")
+                
+                if(converted is not column and not Schema.lossless(column, converted)): converted = column
+                    
+            except Exception as e:
+                ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+                converted = column
+            
+            columns[i] = converted
+        
+        compacted = pd.DataFrame(columns)
+        compacted.columns = frame.columns
+        compacted.index = frame.index
+        
+        return compacted
+    
+    @staticmethod
+    def display(column: pd.Series) -> pd.Series:
+        """ Text of each cell as the sheet read as text would show it, missing cells are empty """
+        
+        dtype = column.dtype
+        
+        if(isinstance(dtype, pd.CategoricalDtype)):
+            values = column.astype(object).to_numpy()
+        elif(pd.api.types.is_datetime64_any_dtype(dtype)):
+            values = column.dt.strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object, na_value=np.nan)
+        elif(pd.api.types.is_float_dtype(dtype) and not isinstance(dtype, pd.api.extensions.ExtensionDtype)):
+            numbers = column.to_numpy()
+            whole = np.isfinite(numbers) & (numbers % 1 == 0) & (np.abs(numbers) < 1e15)
+            values = numbers.astype(str).astype(object)
+            values[whole] = numbers[whole].astype(np.int64).astype(str)
+        elif(isinstance(dtype, pd.api.extensions.ExtensionDtype)):
+            values = column.to_numpy(dtype=object, na_value=np.nan)
+        else:
+            values = column.to_numpy()
+        
+        text = values.astype(str).astype(object)
+        text[column.isna().to_numpy()] = ""
+        
+        return pd.Series(text, index=column.index, dtype=object)
+    
+    @staticmethod
+    def text(frame: pd.DataFrame) -> pd.DataFrame:
+        """ Frame of display strings, what gets rendered, mailed or uploaded """
+        
+        text = pd.DataFrame({i: Schema.display(frame.iloc[:, i]) for i in range(frame.shape[1])}, index=frame.index)
+        text.columns = frame.columns
+        
+        return text
+    
+class Snapshot:
+    """ Parsed sheet grids pickled next to the app, so opening the same workbook again skips the excel parser """
+    
+    PATH: Path = Path(APP_PATH).parent.joinpath("snapshots")
+    
+    LIMIT: int = 64
+    """ Most snapshots kept, the least recently used are deleted first """
+    
+    KEY: Optional[bytes] = None
+    """ Random key of this install, unencrypted snapshots are signed with it so a planted file is never unpickled """
+    
+    @staticmethod
+    def digest(content: bytes) -> str:
+        """ Names the source of the snapshots, a workbook edited since gets new ones """
+        return hashlib.sha256(content).hexdigest()
+    
+    @staticmethod
+    def secret(content: bytes) -> bytes:
+        """ Key for snapshots of a protected workbook, only someone holding its decrypted content can derive it """
+        return base64.urlsafe_b64encode(hashlib.sha256(b"snapshot:" + content).digest())
+    
+    @staticmethod
+    def _key() -> bytes:
+        """ Loads the install key, made on first use """
+        
+        if(Snapshot.KEY is None):
+            Snapshot.KEY = install_key(Snapshot.PATH.joinpath(".key"))
+        
+        return Snapshot.KEY
+    
+    @staticmethod
+    def _sign(data: bytes) -> bytes:
+        return hmac.new(Snapshot._key(), data, hashlib.sha256).digest()
+    
+    @staticmethod
+    def _file(digest: str, sheet: str, as_text: bool) -> Path:
+        return Snapshot.PATH.joinpath(f"{hashlib.sha256(f'{digest}|{sheet}|{as_text}'.encode()).hexdigest()}.pkl")
+    
+    @staticmethod
+    def load(digest: str, sheet: str, as_text: bool, secret: Optional[bytes] = None) -> Optional[pd.DataFrame]:
+        
+        try:
+            if((snapshot := Snapshot._file(digest, sheet, as_text)).exists()):
+                data = snapshot.read_bytes()
+                
+                if(secret):
+                    data = Fernet(secret).decrypt(data)
+                elif(hmac.compare_digest(data[:32], Snapshot._sign(data[32:]))):
+                    data = data[32:]
+                else:
+                    ERROR_LOG.write_info(f"Snapshot '{snapshot.name}' failed its signature check and was removed")
+                    snapshot.unlink(missing_ok=True)
+                    return None
+                
+                os.utime(snapshot) # marks it used, eviction goes by mtime
+                return pickle.loads(data)
+                
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            
+        return None
+    
+    @staticmethod
+    def save(digest: str, sheet: str, as_text: bool, grid: pd.DataFrame, secret: Optional[bytes] = None) -> None:
+        
+        try:
+            os.makedirs(Snapshot.PATH, exist_ok=True)
+            data = pickle.dumps(grid, protocol=pickle.HIGHEST_PROTOCOL)
+            
+            snapshot = Snapshot._file(digest, sheet, as_text)
+            partial = snapshot.with_suffix(f".{os.getpid()}.part")
+            partial.write_bytes(Fernet(secret).encrypt(data) if secret else Snapshot._sign(data) + data)
+            os.replace(partial, snapshot)
+            
+            for old in sorted(Snapshot.PATH.glob("*.pkl"), key=lambda i: i.stat().st_mtime)[:-Snapshot.LIMIT]:
+                old.unlink(missing_ok=True)
+                
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
 
-        queue.put(result)
+class Workbook(Mapping[str, pd.DataFrame]):
+    """ Sheets of one workbook, each parsed into a raw cell grid only when asked for, the header row is picked in memory """
+    
+    LIMIT: int = 4
+    """ Most parsed sheets kept, the least recently used is dropped first """
+    
+    def __init__(self, source: Path | bytes, sheets: list[str], skip: int = 0, as_text: bool = False, grids: Optional[OrderedDict[str, pd.DataFrame]] = None, digest: NullStr = None) -> None:
+        self.source = source
+        """ path of the workbook, or its bytes once decrypted """
+        self.sheets = sheets
+        self.skip = skip
+        self.as_text = as_text
+        """ cells were read as text, so column types are not inferred again """
+        self.grids: OrderedDict[str, pd.DataFrame] = OrderedDict() if grids is None else grids
+        self.digest = digest
+        """ Snapshot digest of the source, None skips snapshots """
+        self.secret = Snapshot.secret(source) if (digest is not None and isinstance(source, bytes)) else None
+        self.frames: dict[str, tuple[pd.DataFrame, pd.DataFrame]] = {}
+        """ sliced frame of each sheet alongside the grid it was cut from """
+    
+    @property
+    def decrypted(self) -> Optional[bytes]:
+        """ content of a protected file after decryption, handed back so the session can keep it """
+        return self.source if isinstance(self.source, bytes) else None
+    
+    def reheader(self, skip: int) -> 'Workbook':
+        """ Same grids with the header taken from another row """
+        return Workbook(self.source, self.sheets, skip, self.as_text, self.grids, self.digest)
+    
+    def ready(self, sheet: str) -> bool:
+        """ Whether the sheet's frame can be read without parsing anything """
+        return (cached := self.frames.get(sheet)) is not None and cached[0] is self.grids.get(sheet)
+    
+    def detach(self, sheets: list[str]) -> 'Workbook':
+        """ Copy handed to a worker process to parse sheets in, it carries only the grids of those already loaded """
+        return Workbook(self.source, self.sheets, self.skip, self.as_text, OrderedDict((sheet, self.grids[sheet]) for sheet in sheets if sheet in self.grids), self.digest)
+    
+    def adopt(self, sheet: str, grid: pd.DataFrame, frame: pd.DataFrame) -> None:
+        """ Keeps a sheet parsed by a worker process as if it was parsed here """
+        self._keep(sheet, grid)
+        self.frames[sheet] = (grid, frame)
+    
+    def _keep(self, sheet: str, grid: pd.DataFrame) -> None:
+        self.grids[sheet] = grid
+        self.grids.move_to_end(sheet)
+        
+        while(len(self.grids) > self.LIMIT):
+            self.grids.popitem(last=False)
+    
+    def grid(self, sheet: str) -> pd.DataFrame:
+        """ Parses the sheet on first use and keeps it among the LIMIT most recent """
+        
+        if(sheet not in self.sheets): raise KeyError(sheet)
+        
+        if(sheet in self.grids):
+            self.grids.move_to_end(sheet)
+            return self.grids[sheet]
+        
+        if(self.digest is None or (grid := Snapshot.load(self.digest, sheet, self.as_text, self.secret)) is None):
+            source = io.BytesIO(self.source) if isinstance(self.source, bytes) else self.source.resolve()
+            grid = pd.read_excel(io=source, sheet_name=sheet, header=None, dtype=str if self.as_text else None)
+            
+            if(self.digest is not None): Snapshot.save(self.digest, sheet, self.as_text, grid, self.secret)
+        
+        self._keep(sheet, grid)
+        
+        return grid
     
     @staticmethod
-    def fetch_decrypted_file(queue: Queue, file_path: Path, skip:int = 0) -> None:
-        """ Fetches file that is not encrypted """
+    def header(names: list[Any]) -> list[Any]:
+        """ Column names of a header row, blank ones named and repeats numbered like read_excel does """
+        
+        columns: list[Any] = []
+        seen: dict[str, int] = {}
+        
+        for i, name in enumerate(names):
+            name = f"Unnamed: {i}" if pd.isna(name) else name
+            
+            if((count := seen.get(str(name), 0))):
+                columns.append(f"{name}.{count}")
+            else:
+                columns.append(name)
+            seen[str(name)] = count + 1
+        
+        return columns
+    
+    def _slice(self, grid: pd.DataFrame) -> pd.DataFrame:
+        """ What read_excel with skiprows=skip would have returned for this grid """
+        
+        rows = grid.iloc[self.skip:]
+        
+        if(rows.empty): return pd.DataFrame()
+        
+        frame = rows.iloc[1:].reset_index(drop=True)
+        frame.columns = self.header(rows.iloc[0].tolist())
+        if(not self.as_text): frame = frame.infer_objects()
+        dataRefine(frame)
+        
+        return Schema.classify(frame).compact(frame)
+    
+    def __getitem__(self, sheet: str) -> pd.DataFrame:
+        grid = self.grid(sheet)
+        
+        # a slice keeps its grid alive, so it goes once the grid has left the LRU (grids are shared with reheadered copies)
+        for stale in self.frames.keys() - self.grids.keys():
+            del self.frames[stale]
+        
+        if((cached := self.frames.get(sheet)) is None or cached[0] is not grid):
+            cached = self.frames[sheet] = (grid, self._slice(grid))
+        
+        return cached[1]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.sheets)
+    
+    def __len__(self) -> int:
+        return len(self.sheets)
+
+class SheetStream:
+    """ Reads one sheet with openpyxl in read only mode and hands it out a block of rows at a time """
+    
+    def __init__(self, source: Path | bytes, sheet: NullStr = None, skip: int = 0, rows: int = 500, as_text: bool = False) -> None:
+        self.book = openpyxl.load_workbook(io.BytesIO(source) if isinstance(source, bytes) else str(source.resolve()), read_only=True, data_only=True)
+        self.sheet = self.book[sheet] if sheet else self.book.worksheets[0]
+        self.rows = rows
+        self.as_text = as_text
+        self.cells = self.sheet.iter_rows(values_only=True)
+        
+        for _ in range(skip): next(self.cells, None)
+        
+        self.columns = [str(i).strip().replace('\n','') for i in Workbook.header(list(next(self.cells, None) or []))]
+        self.estimate = max(0, (self.sheet.max_row or 0) - skip - 1)
+        """ rows below the header as the sheet dimensions claim, blank rows are skipped while reading """
+    
+    def _frame(self, block: list[tuple[Any, ...]]) -> pd.DataFrame:
+        width = len(self.columns)
+        block = [tuple(row[:width]) + (None,) * (width - len(row)) for row in block]
+        
+        if(self.as_text):
+            block = [tuple(None if cell is None else str(cell) for cell in row) for row in block]
+            return pd.DataFrame(block, columns=self.columns, dtype=object)
+        
+        return pd.DataFrame(block, columns=self.columns).infer_objects()
+    
+    def __iter__(self) -> Generator[pd.DataFrame, None, None]:
+        block: list[tuple[Any, ...]] = []
+        
+        for row in self.cells:
+            if(all(cell is None for cell in row)): continue
+            
+            block.append(row)
+            
+            if(len(block) >= self.rows):
+                yield self._frame(block)
+                block = []
+        
+        if(block): yield self._frame(block)
+    
+    def close(self) -> None:
+        self.book.close()
+
+class Ledger(Mapping[str, pd.DataFrame]):
+    """ Workbooks of one payroll period loaded together, every sheet keyed as '<file>/<sheet>' """
+    
+    def __init__(self, workbooks: dict[str, Workbook]) -> None:
+        self.workbooks = workbooks
+        """ Workbook of each file, keyed by its name without the extension """
+    
+    def reheader(self, skip: int) -> 'Ledger':
+        """ Same workbooks with the header taken from another row """
+        return Ledger({name: data.reheader(skip) for name, data in self.workbooks.items()})
+    
+    def _find(self, key: str) -> tuple[Workbook, str]:
+        name, _, sheet = key.partition('/')
+        
+        if(name not in self.workbooks): raise KeyError(key)
+        
+        return self.workbooks[name], sheet
+    
+    def ready(self, key: str) -> bool:
+        data, sheet = self._find(key)
+        return data.ready(sheet)
+    
+    def detach(self, keys: list[str]) -> 'Ledger':
+        """ Copy handed to a worker process, only the workbooks of keys go along """
+        
+        sheets: dict[str, list[str]] = {}
+        
+        for key in keys:
+            name, _, sheet = key.partition('/')
+            sheets.setdefault(name, []).append(sheet)
+        
+        return Ledger({name: self.workbooks[name].detach(names) for name, names in sheets.items() if name in self.workbooks})
+    
+    def adopt(self, key: str, grid: pd.DataFrame, frame: pd.DataFrame) -> None:
+        data, sheet = self._find(key)
+        data.adopt(sheet, grid, frame)
+    
+    def grid(self, key: str) -> pd.DataFrame:
+        data, sheet = self._find(key)
+        return data.grid(sheet)
+    
+    def __getitem__(self, key: str) -> pd.DataFrame:
+        data, sheet = self._find(key)
+        return data[sheet]
+    
+    def __iter__(self) -> Iterator[str]:
+        return (f"{name}/{sheet}" for name, data in self.workbooks.items() for sheet in data)
+    
+    def __len__(self) -> int:
+        return sum(len(data) for data in self.workbooks.values())
+
+class DecryptionCache:
+    """ Decrypted workbook bytes kept for the session, so a protected file is only decrypted once """
+    
+    entries: dict[tuple[str, int, int, str], bytes] = {}
+    
+    @staticmethod
+    def key(file_path: Path, password: str) -> Optional[tuple[str, int, int, str]]:
+        """ A change of content, size or password misses the cache """
+        
+        try:
+            stat = file_path.stat()
+            return (str(file_path.resolve()), stat.st_size, stat.st_mtime_ns, hashlib.sha256(password.encode()).hexdigest())
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            
+        return None
+    
+    @staticmethod
+    def recall(file_path: Path, password: str) -> Optional[bytes]:
+        if((key := DecryptionCache.key(file_path, password)) is None): return None
+        
+        return DecryptionCache.entries.get(key)
+    
+    @staticmethod
+    def keep(file_path: Path, password: str, data: Any) -> None:
+        """ Keeps the decrypted bytes, or those a protected Workbook came back with """
         
-        result: list[Optional[list[str]] | Optional[dict[str, pd.DataFrame]]] = [None, None]
+        decrypted = data if isinstance(data, bytes) else (data.decrypted if isinstance(data, Workbook) else None)
+        
+        if(decrypted is not None and (key := DecryptionCache.key(file_path, password)) is not None):
+            DecryptionCache.entries[key] = decrypted
+    
+    @staticmethod
+    def clear() -> None:
+        """ Drops every decrypted file, called when the session ends """
+        DecryptionCache.entries.clear()
+
+class Decryption:
+    """ Handles file decryption  """
+    
+    
+    @staticmethod
+    def is_encrypted(file:io.BufferedReader) -> bool:
+        """ Checks if file is encrypted """
+        return msoffcrypto.OfficeFile(file).is_encrypted()
+    
+    @staticmethod
+    def decrypting_file(file_path:Path, decrypted:io.BytesIO, password:str) -> tuple[bool, io.BytesIO]:
+        """ Decrypts the file and extracts content into BytesIO """
         
+        success = False
+        try:
+            with open(file_path.resolve(), "rb") as f:
+                file = msoffcrypto.OfficeFile(f)
+                file.load_key(password=password)  
+                file.decrypt(decrypted)
+                success = True
+                
+        except msoffcrypto.exceptions.InvalidKeyError as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+
+        except msoffcrypto.exceptions.DecryptionError as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            
+        return (success, decrypted)
+    
+    @staticmethod
+    def is_encrypted_wrapper(queue: Queue, file_path:Path) -> None:
+        """ Wrapper for is_encrypted  """
+        result = None
+
         try:
-            data = pd.read_excel(io=file_path.resolve(), sheet_name=None, skiprows=skip)
+            if(file_path.exists()):
+                with open(file_path.resolve(), 'rb') as f:
+                    result = Decryption.is_encrypted(f)
+                    
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            result = None
+
+        queue.put(result)
+    
+    @staticmethod
+    def open_workbook(file_path: Path, password: NullStr = None, skip: int = 0, decrypted_bytes: Optional[bytes] = None) -> Optional[Workbook]:
+        """ Workbook of a file with its first sheet parsed, a password means the file is encrypted """
+        
+        if(password is None):
+            with pd.ExcelFile(file_path.resolve()) as excel:
+                sheets = [str(i) for i in excel.sheet_names]
+            
+            data = Workbook(file_path, sheets, skip, digest=Snapshot.digest(file_path.read_bytes())) if sheets else None
             
-            if(data):
-                sheets = list(data.keys())
+        else:
+            with io.BytesIO(decrypted_bytes or b'') as decrypted:
+                if(decrypted_bytes is None):
+                    success, file = Decryption.decrypting_file(file_path, decrypted, password)
+                else:
+                    success, file = True, decrypted
                 
-                for i in sheets: dataRefine(data[i])
+                if(not success): return None
                 
-                result[0] = sheets
+                content = decrypted_bytes if decrypted_bytes is not None else file.getvalue()
+            
+            with pd.ExcelFile(io.BytesIO(content)) as excel:
+                sheets = [str(i) for i in excel.sheet_names]
+            
+            data = Workbook(content, sheets, skip, as_text=True, digest=Snapshot.digest(content)) if sheets else None
+        
+        if(data is not None): data[data.sheets[0]] # shown right away, so parse it here instead of in the gui
+        
+        return data
+    
+    @staticmethod
+    def fetch_decrypted_file(queue: Queue, file_path: Path, skip:int = 0) -> None:
+        """ Fetches file that is not encrypted """
+        
+        result: list[Optional[list[str]] | Optional[Workbook]] = [None, None]
+        
+        try:
+            if((data := Decryption.open_workbook(file_path, skip=skip)) is not None):
+                result[0] = data.sheets
                 result[1] = data
             
         except Exception as e:
@@ -493,31 +1536,329 @@ class Decryption:
         queue.put(tuple(result))
     
     @staticmethod
-    def fetch_encrypted_file(queue: Queue, file_path:Path, password:str, skip:int = 0) -> None:
-        """ Fetch content from encrypted file """
+    def fetch_encrypted_file(queue: Queue, file_path:Path, password:str, skip:int = 0, decrypted_bytes: Optional[bytes] = None) -> None:
+        """ Fetch content from encrypted file, decrypted_bytes from DecryptionCache skips decryption """
         
-        result: list[Optional[list[str]] | Optional[dict[str, pd.DataFrame]]] = [None,None]
+        result: list[Optional[list[str]] | Optional[Workbook]] = [None,None]
 
         try:
-            with io.BytesIO() as decrypted:
-                success, file = Decryption.decrypting_file(file_path, decrypted, password)
-            
-                if(success):
-                    
-                    data = pd.read_excel(io=file,sheet_name=None,skiprows=skip, dtype=str)
-                    sheets = list(data.keys())
-                    
-                    if(data):
-                        for i in sheets: dataRefine(data[i])
-                        
-                        result[0] = sheets
-                        result[1] = data
+            if((data := Decryption.open_workbook(file_path, password, skip, decrypted_bytes)) is not None):
+                result[0] = data.sheets
+                result[1] = data
                         
         except Exception as e:
             ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
         
         queue.put(tuple(result))    
+    
+    @staticmethod
+    def fetch_sheets(queue: Queue, data: Workbook | Ledger, sheets: list[str]) -> None:
+        """ Parses sheets of a loaded workbook, each comes back with its grid so the gui can keep both """
+        
+        result: list[tuple[str, pd.DataFrame, pd.DataFrame]] = []
+        
+        try:
+            for sheet in sheets:
+                frame = data[sheet]
+                result.append((sheet, data.grid(sheet), frame))
+                
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+        
+        queue.put(result)
+    
+    @staticmethod
+    def ingest(file_path: Path, password: NullStr = None, skip: int = 0, decrypted_bytes: Optional[bytes] = None) -> Optional[Workbook]:
+        """ Loads one workbook of a batch inside a pool worker, its first LIMIT sheets come back parsed """
+        
+        try:
+            if((data := Decryption.open_workbook(file_path, password, skip, decrypted_bytes)) is not None):
+                for sheet in data.sheets[:Workbook.LIMIT]: data[sheet]
+                
+            return data
+        
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+        
+        return None
+    
+    @staticmethod
+    def workbooks(folder: Path) -> list[Path]:
+        """ Excel files of a folder, lock files left by an open excel are skipped """
+        return sorted(i for i in folder.iterdir() if i.is_file() and i.suffix.lower() in ('.xlsx', '.xls') and not i.name.startswith('~$'))
+    
+    @staticmethod
+    def fetch_folder(folder: Path, passwords: Optional[Mapping[str, str]] = None, skip: int = 0, workers: Optional[int] = None) -> 'Ledger':
+        """ Loads every workbook of a folder side by side in a process pool, passwords are looked up by file name """
+        
+        passwords = passwords or {}
+        files = Decryption.workbooks(folder)
+        workbooks: dict[str, Workbook] = {}
+        
+        if(not files): return Ledger(workbooks)
+        
+        with ProcessPoolExecutor(max_workers=max(1, min(len(files), workers or PandaWrapper.SHARDS))) as pool:
+            jobs = {}
+            
+            for file in files:
+                password = passwords.get(file.name)
+                jobs[pool.submit(Decryption.ingest, file, password, skip, DecryptionCache.recall(file, password) if password else None)] = (file, password)
+            
+            for job in as_completed(jobs):
+                file, password = jobs[job]
+                
+                try:
+                    if((data := job.result()) is not None):
+                        workbooks[file.stem] = data
+                        if(password): DecryptionCache.keep(file, password, data)
+                    else:
+                        ERROR_LOG.write_info(f"Excel File '{file}' could not be loaded")
+                        
+                except Exception as e:
+                    ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+        
+        return Ledger({file.stem: workbooks[file.stem] for file in files if file.stem in workbooks})
 
+class SharedFrame:
+    """ Frame published once into shared memory, worker processes attach to it instead of unpickling a copy """
+    
+    SEPARATOR: str = "\x1f"
+    """ Joins the cells of a text column, columns holding it are pickled instead """
+    
+    CHUNK: int = 1024
+    """ Rows pickled together in columns that are neither numbers nor text """
+    
+    MISSING: tuple[Any, ...] = (None, None, np.nan, pd.NA, pd.NaT)
+    """ Missing values of a text column by their code, 0 marks a present cell """
+    
+    LIMIT: int = 4
+    """ Most frames kept published, the oldest one no job uses is released first """
+    
+    _published: OrderedDict[str, tuple["SharedFrame", shared_memory.SharedMemory]] = OrderedDict()
+    """ handle and segment of every published frame by the token of its content """
+    _retired: dict[str, shared_memory.SharedMemory] = {}
+    """ segments cleared while a job still used them, released once it ends """
+    _pins: dict[str, list[Process]] = {}
+    """ processes started with a handle to each segment, by segment name """
+    _attached: dict[str, shared_memory.SharedMemory] = {}
+    
+    def __init__(self, name: str, size: int, specs: list[tuple[Any, str, int, int, Any]], index: Optional[bytes], start: int = 0, stop: Optional[int] = None) -> None:
+        self.name = name
+        self.size = size
+        self.specs = specs
+        """ (column, kind, offset, nbytes, dtype) of every column in the segment, the processes share one tracker so only the publisher unlinks it """
+        self.index = index
+        """ pickled index of the rows from start to stop, None for a default one """
+        self.start = start
+        self.stop = size if stop is None else stop
+    
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # a worker maps the segment as soon as it receives the handle, before it reads any row
+        self.__dict__.update(state)
+        self._attach()
+    
+    @property
+    def columns(self) -> list[Any]:
+        return [spec[0] for spec in self.specs]
+    
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.stop - self.start, len(self.specs))
+    
+    @staticmethod
+    def _encode(column: pd.Series) -> tuple[str, list[bytes | np.ndarray], Any]:
+        """ Numeric columns are copied as they are, other columns get per row (or per chunk) offsets so a range is read without the rest """
+        
+        values = column.to_numpy()
+        
+        if(isinstance(column.dtype, np.dtype) and values.dtype.kind in "biufcmM"):
+            return "array", [np.ascontiguousarray(values)], values.dtype.str
+        
+        if(values.dtype == object):
+            missing = pd.isna(values)
+            cells = values[~missing]
+            
+            if(all(type(cell) is str for cell in cells)):
+                text = SharedFrame.SEPARATOR.join(np.where(missing, "", values).tolist()).encode("utf-8")
+                # utf-8 never uses the separator byte inside a character, so its positions are the cell boundaries
+                separators = np.flatnonzero(np.frombuffer(text, dtype=np.uint8) == ord(SharedFrame.SEPARATOR))
+                
+                if(separators.shape[0] == max(0, len(values) - 1)):
+                    starts = np.concatenate(([0], separators + 1, [len(text) + 1])).astype(np.int64) if len(values) else np.zeros(1, dtype=np.int64)
+                    codes = np.zeros(len(values), dtype=np.uint8)
+                    codes[missing] = [1 if cell is None else next((i for i, kind in enumerate(SharedFrame.MISSING[2:], 2) if cell is kind), 2) for cell in values[missing]]
+                    return "text", [starts, codes, text], column.dtype
+        
+        chunks = [pickle.dumps(column.array[i:i+SharedFrame.CHUNK], protocol=pickle.HIGHEST_PROTOCOL) for i in range(0, len(values), SharedFrame.CHUNK)]
+        bounds = np.cumsum([0] + [len(chunk) for chunk in chunks]).astype(np.int64)
+        
+        return "pickle", [bounds, b"".join(chunks)], column.dtype
+    
+    @staticmethod
+    def token(frame: pd.DataFrame) -> NullStr:
+        """ Hash of the content of frame, None when a cell cannot be hashed """
+        
+        try:
+            digest = hashlib.sha256(repr((frame.shape, list(frame.columns), [str(i) for i in frame.dtypes])).encode())
+            digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+            return digest.hexdigest()
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+        
+        return None
+    
+    @staticmethod
+    def publish(frame: pd.DataFrame) -> "SharedFrame":
+        """ Copies frame into a shared memory segment once, later calls with the same content reuse it """
+        
+        SharedFrame._sweep()
+        
+        if((token := SharedFrame.token(frame)) is not None and (published := SharedFrame._published.get(token)) is not None):
+            SharedFrame._published.move_to_end(token)
+            return published[0]
+        
+        specs: list[tuple[Any, str, int, int, Any]] = []
+        parts: list[tuple[int, bytes | np.ndarray]] = []
+        offset = 0
+        
+        for position in range(frame.shape[1]):
+            kind, buffers, dtype = SharedFrame._encode(frame.iloc[:, position])
+            nbytes = 0
+            
+            for buffer in buffers:
+                parts.append((offset + nbytes, buffer))
+                nbytes += buffer.nbytes if isinstance(buffer, np.ndarray) else len(buffer)
+            
+            specs.append((frame.columns[position], kind, offset, nbytes, dtype))
+            offset += -(-nbytes // 8) * 8 # keeps the offset arrays of the next column aligned
+        
+        segment = shared_memory.SharedMemory(create=True, size=max(1, offset))
+        
+        for cursor, part in parts:
+            data = part.view(np.uint8).reshape(-1) if isinstance(part, np.ndarray) else part
+            segment.buf[cursor:cursor+len(data)] = data
+        
+        index = None if isinstance(frame.index, pd.RangeIndex) and frame.index.start == 0 and frame.index.step == 1 else pickle.dumps(frame.index, protocol=pickle.HIGHEST_PROTOCOL)
+        handle = SharedFrame(segment.name, frame.shape[0], specs, index)
+        
+        SharedFrame._published[token or segment.name] = (handle, segment)
+        
+        # segments a running job reads are skipped, so there can be more than LIMIT for a while
+        for stale in [key for key, (published, _) in SharedFrame._published.items() if not SharedFrame._busy(published.name)][:max(0, len(SharedFrame._published) - SharedFrame.LIMIT)]:
+            SharedFrame._release(SharedFrame._published.pop(stale)[1])
+        
+        return handle
+    
+    @staticmethod
+    def pin(handle: "SharedFrame", *processes: Process) -> None:
+        """ Keeps the segment of handle until every process given has ended, call it before they start """
+        SharedFrame._pins.setdefault(handle.name, []).extend(processes)
+    
+    @staticmethod
+    def _busy(name: str) -> bool:
+        """ Whether a pinned process has not ended yet, exitcode is None until it has """
+        
+        if(name in SharedFrame._pins):
+            SharedFrame._pins[name] = [process for process in SharedFrame._pins[name] if process.exitcode is None]
+            
+            if(SharedFrame._pins[name]): return True
+            
+            del SharedFrame._pins[name]
+        
+        return False
+    
+    @staticmethod
+    def _sweep() -> None:
+        """ Releases the cleared segments whose jobs have ended """
+        
+        for name in [name for name in SharedFrame._retired if not SharedFrame._busy(name)]:
+            SharedFrame._release(SharedFrame._retired.pop(name))
+    
+    @staticmethod
+    def _release(segment: shared_memory.SharedMemory) -> None:
+        
+        try:
+            segment.close()
+            segment.unlink()
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+    
+    @staticmethod
+    def clear() -> None:
+        """ Releases every published segment, one a running job still reads is released after the job ends """
+        
+        while(SharedFrame._published):
+            handle, segment = SharedFrame._published.popitem()[1]
+            
+            if(SharedFrame._busy(handle.name)):
+                SharedFrame._retired[handle.name] = segment
+            else:
+                SharedFrame._release(segment)
+        
+        SharedFrame._sweep()
+    
+    def rows(self, start: int, stop: int) -> "SharedFrame":
+        """ Handle to a range of rows, only the range is read by whoever materializes it """
+        
+        start, stop = self.start + start, min(self.stop, self.start + stop)
+        index = None if self.index is None else pickle.dumps(pickle.loads(self.index)[start-self.start:stop-self.start], protocol=pickle.HIGHEST_PROTOCOL)
+        
+        return SharedFrame(self.name, self.size, self.specs, index, start, stop)
+    
+    def _attach(self) -> shared_memory.SharedMemory:
+        
+        if((segment := SharedFrame._attached.get(self.name)) is None):
+            segment = SharedFrame._attached[self.name] = shared_memory.SharedMemory(name=self.name)
+        
+        return segment
+    
+    def to_frame(self) -> pd.DataFrame:
+        """ Rows start to stop, numeric columns as read only views of the segment, only their own cells are decoded from the others """
+        
+        buffer = self._attach().buf
+        data: dict[int, Any] = {}
+        start, stop = self.start, self.stop
+        
+        for position, (_, kind, offset, nbytes, dtype) in enumerate(self.specs):
+            
+            if(kind == "array"):
+                values = np.ndarray(self.size, dtype=np.dtype(dtype), buffer=buffer, offset=offset)[start:stop]
+                values.flags.writeable = False
+                
+            elif(kind == "text"):
+                starts = np.ndarray(self.size + 1, dtype=np.int64, buffer=buffer, offset=offset)
+                codes = np.ndarray(self.size, dtype=np.uint8, buffer=buffer, offset=offset + starts.nbytes)[start:stop]
+                base = offset + starts.nbytes + self.size
+                
+                cells = bytes(buffer[base+starts[start]:base+starts[stop]-1]).decode("utf-8").split(SharedFrame.SEPARATOR) if stop > start else []
+                values = np.array(cells, dtype=object)
+                
+                for missing in np.flatnonzero(codes):
+                    values[missing] = SharedFrame.MISSING[codes[missing]]
+                
+            else:
+                bounds = np.ndarray(-(-self.size // SharedFrame.CHUNK) + 1, dtype=np.int64, buffer=buffer, offset=offset)
+                base = offset + bounds.nbytes
+                first, last = start // SharedFrame.CHUNK, -(-stop // SharedFrame.CHUNK)
+                chunks = [pickle.loads(buffer[base+bounds[i]:base+bounds[i+1]]) for i in range(first, last)] if stop > start else []
+                
+                if(chunks):
+                    values = type(chunks[0])._concat_same_type(chunks)[start - first * SharedFrame.CHUNK:stop - first * SharedFrame.CHUNK]
+                else:
+                    values = pd.array([], dtype=dtype)
+            
+            data[position] = pd.Series(values, dtype=np.dtype(dtype) if kind == "array" else dtype, copy=False)
+        
+        frame = pd.DataFrame(data, copy=False)
+        frame.columns = pd.Index(self.columns, dtype=object)
+        frame.index = pickle.loads(self.index) if self.index is not None else pd.RangeIndex(start, stop)
+        
+        return frame
+    
+    @staticmethod
+    def resolve(data: "pd.DataFrame | SharedFrame") -> pd.DataFrame:
+        return data.to_frame() if isinstance(data, SharedFrame) else data
+    
 class MailingWrapper:
     """ Wrapper for Mailing class """
     
@@ -547,26 +1888,63 @@ class MailingWrapper:
     async def _sendMail(self, mail:'AsyncMailing', pdf_path: Path, id:str, toAddr:str) -> bool:
         """ Wrapper for continuous mail sending """
         
-        def __make_msg__(mailing: MailingWrapper) -> MIMEMultipart:
+        def __make_msg__(mailing: MailingWrapper) -> Optional[MIMEMultipart]:
             msg = AsyncMessage(ERROR_LOG)
             msg.addTxtMsg(f"Please find attached below the salary slip of {mailing.month.capitalize()}-{mailing.year}",'plain')
             msg.addAttach(pdf_path, f'employee_{id}.pdf')
             msg.addDetails(f"Salary slip of {mailing.month.capitalize()}-{mailing.year}")
-            return msg.get_MIME()
+            return msg.get_MIME() if msg.status else None
+            
+        msg = await to_thread(__make_msg__, self)
+        return msg is not None and await mail.sendMail(toAddr, msg)
+        
+    async def _sendBytes(self, mail:'AsyncMailing', pdf: bytes, id:str, toAddr:str) -> bool:
+        """ Mails a slip rendered in memory """
+        
+        def __make_msg__(mailing: MailingWrapper) -> Optional[MIMEMultipart]:
+            msg = AsyncMessage(ERROR_LOG)
+            msg.addTxtMsg(f"Please find attached below the salary slip of {mailing.month.capitalize()}-{mailing.year}",'plain')
+            msg.addAttachBytes(pdf, f'employee_{file_clean(id)}.pdf')
+            msg.addDetails(f"Salary slip of {mailing.month.capitalize()}-{mailing.year}")
+            return msg.get_MIME() if msg.status else None
             
         msg = await to_thread(__make_msg__, self)
-        await mail.sendMail(toAddr, msg)
-        return mail.status
+        return msg is not None and await mail.sendMail(toAddr, msg)
+    
+    async def dispatch(self, jobs: Iterable[tuple[str, str, str]], mail:'AsyncMailing', where: Optional[Path], pool_size: Optional[int] = None, progress: Optional['Progress'] = None) -> tuple[int,int]:
+        """ Renders (id, email, html) jobs to pdf bytes and mails them while the next ones render """
+        
+        sent, total = 0, 0
+        
+        async def herald(job: tuple[str, str, str]) -> None:
+            nonlocal sent, total
+            emp_id, toAddr, html_content = job
+            ok = False
+            
+            if(email_check(toAddr)):
+                status, _, pdf = await PDFGenerator.generate_pdf_bytes(emp_id, html_content, where)
+                ok = status and await self._sendBytes(mail, pdf, emp_id, toAddr)
+            else:
+                ERROR_LOG.write_info(f"Invalid email '{toAddr}' for employee {emp_id}")
+            
+            if(ok): sent += 1
+            total += 1
+            if(progress is not None): progress.update(ok)
+        
+        await PDFGenerator.feed(jobs, herald, max(1, pool_size or PDFGenerator.POOL_SIZE))
         
+        return sent, total
+    
     @staticmethod
     async def report(tasks:list[types.CoroutineType]) -> int:
         result:list[bool] = await gather(*tasks)
         
         return len(list(filter(lambda x: x, result)))
     
-    def massMail(self, data:pd.DataFrame, code_column:str, email_col:str, dir_path:Path, queue:Queue) -> None:
+    def massMail(self, data:pd.DataFrame | SharedFrame, code_column:str, email_col:str, dir_path:Path, queue:Queue) -> None:
         """ Sends email on basis of pdf files present in chosen directory """
                 
+        data = Schema.text(SharedFrame.resolve(data))
         count,total = 0, 0
         email_server = AsyncMailing(**MAIL_CRED,error_log=ERROR_LOG)
         columns = {j:i for i,j in enumerate(data.columns)}
@@ -636,9 +2014,9 @@ class DatabaseWrapper:
         queue.put(create_result)
         self.endThis()
         
-    def fill_table(self, queue: Queue, institute: InstituteList, type: TypeList, year:int, month: MonthList, data: pd.DataFrame):
+    def fill_table(self, queue: Queue, institute: InstituteList, type: TypeList, year:int, month: MonthList, data: pd.DataFrame | SharedFrame):
         """ Attempts to insert data or update data in db (Doesn't ask for updation)"""
-        upsert_result = self.connectToDatabase().updateData(data,month,year,institute,type)
+        upsert_result = self.connectToDatabase().updateData(Schema.text(SharedFrame.resolve(data)),month,year,institute,type)
         queue.put(upsert_result)
         self.endThis()
         
@@ -654,7 +2032,17 @@ class DatabaseWrapper:
         
 class PandaWrapper:
     """ Panda wrapper for process """
-    def __init__(self, servitor:pd.DataFrame, identification_rosette:str, pdf_template:PDFTemplate) -> None:
+    
+    SHARDS: int = os.cpu_count() or 1
+    """ Most processes a bulk print is split into """
+    
+    SHARD_ROWS: int = 50
+    """ Fewest rows worth starting another process for """
+    
+    RENDER_ROWS: int = 500
+    """ Rows rendered to html together, bounds the html held in memory at once """
+    
+    def __init__(self, servitor:pd.DataFrame | SharedFrame, identification_rosette:str, pdf_template:PDFTemplate) -> None:
         self.servitor = servitor
         self.identification_rosette = identification_rosette
         self.pdf = pdf_template
@@ -662,17 +2050,82 @@ class PandaWrapper:
         self.vars: dict[str, NullStr] = {}
         self.html_file: str = ""
         self.column_auspex: dict[str, NullStr] = {}
+        self.projection: tuple[list[str], np.ndarray, dict[str, str]] = ([], np.empty(0, dtype=int), {})
+        """ (keys, column positions, constants) every row is projected through """
+    
+    @property
+    def servitor(self) -> pd.DataFrame:
+        """ A shared frame is only attached to once the process asks for its rows """
+        
+        if(isinstance(self._servitor, SharedFrame)):
+            self._servitor = self._servitor.to_frame()
+        
+        return self._servitor
+    
+    @servitor.setter
+    def servitor(self, servitor: pd.DataFrame | SharedFrame) -> None:
+        self._servitor = servitor
     
     def load_scriptures(self) -> None:
         
         if(self.pdf.chosen_json is not None): 
-            self.column_auspex = {i:mapping(list(self.columns.keys()), j) for i,j in self.pdf.load_json(self.pdf.chosen_json).items()}
+            index = ColumnIndex(self.columns.keys())
+            self.column_auspex = {i:index.find(j) for i,j in self.pdf.load_json(self.pdf.chosen_json).items()}
             self.column_auspex[CODE_COL] = self.identification_rosette
             self.column_auspex["branch"] = "Sion"
+        
+        keys = [key for key, val in self.column_auspex.items() if val in self.columns]
+        positions = np.array([self.columns[self.column_auspex[key]] for key in keys], dtype=int) # type: ignore
+        constants = {key: val or "-" for key, val in self.column_auspex.items() if val not in self.columns}
+        self.projection = (keys, positions, constants)
+    
+    def transcribe(self, servitor: Optional[pd.DataFrame] = None, **extra: str) -> dict[str, list[str]]:
+        """ Values of every placeholder for all rows, the planned columns are taken out of the frame and cleaned a column at a time """
+        
+        servitor = self.servitor if servitor is None else servitor
+        keys, positions, constants = self.projection
+        rows = servitor.shape[0]
+        
+        values = Schema.text(servitor.take(positions, axis=1))
+        scripture = {key: [value] * rows for key, value in constants.items()}
+        
+        for position, key in enumerate(keys):
+            scripture[key] = values.iloc[:, position].str.replace('\n', '', regex=False).str.strip().tolist()
+        
+        scripture.update({key: [value] * rows for key, value in extra.items()})
+        
+        return scripture
+    
+    def recite(self, servitor: Optional[pd.DataFrame] = None, **extra: str) -> Generator[dict[str, str], None, None]:
+        """ Projects rows through the plan of load_scriptures, one dict per row """
+        
+        scripture = self.transcribe(servitor, **extra)
+        
+        for row in zip(*scripture.values()):
+            yield dict(zip(scripture, row))
+    
+    def widest(self, **extra: str) -> dict[str, str]:
+        """ Longest value of every projected column, the overlay is laid out around them so each slot gets the room its cell has """
+        
+        scripture = self.transcribe(**extra)
+        
+        return {key: max(dict.fromkeys(values), key=lambda i: text_width(i, 1)) for key, values in scripture.items() if values}
+    
+    @staticmethod
+    def shard(servitor: pd.DataFrame | SharedFrame, shards: Optional[int] = None) -> list[pd.DataFrame | SharedFrame]:
+        """ Splits rows into contiguous ranges, one for each worker process """
+        
+        count = max(1, min(shards or PandaWrapper.SHARDS, servitor.shape[0] // PandaWrapper.SHARD_ROWS))
+        step = max(1, -(-servitor.shape[0] // count))
+        
+        if(isinstance(servitor, SharedFrame)):
+            return [servitor.rows(i, i+step) for i in range(0, servitor.shape[0], step)] or [servitor]
+        
+        return [servitor.iloc[i:i+step] for i in range(0, servitor.shape[0], step)] or [servitor]
     
     def find_by_id(self, queue: Queue,emp_id:str):
         """ Finds employee by emp_id in identification_rosette column of Dataframe """
-        search_result = self.servitor[self.servitor[self.identification_rosette]==emp_id]
+        search_result = self.servitor[(Schema.display(self.servitor[self.identification_rosette])==emp_id).to_numpy()]
         if(not search_result.empty):
             queue.put(self.litany_of_auspex(search_result.iloc[[0]]))
         else:
@@ -686,50 +2139,170 @@ class PandaWrapper:
         """ Praised be the machine spirit of the blessed augurs (Returns data about id, which should exist)"""
         return search_result
     
-    @staticmethod
-    async def get_success(tasks:list[types.CoroutineType]) -> tuple[int,int]:
-        result = await gather(*tasks)
+    def litany_of_scrolls(self, queue: Queue, dropzone:Path, month:MonthList, year:int, pool_size: Optional[int] = None, batch_size: Optional[int] = None, backend: NullStr = None, shard: int = 0, resume: bool = False, tomes: Optional[Iterable[pd.DataFrame]] = None, total: Optional[int] = None, sample: Optional[dict[str, str]] = None):
+        """ Oh holy generator, grants us the sacred ink of thou's blessed blood (BulkPrint Process), sample is the widest slip of the whole sheet so every shard lays the overlay out alike """
+        if(backend in PDFGenerator.BACKENDS): PDFGenerator.backend = backend
+        task_completed = 0
+        total_task = self.servitor.shape[0] if total is None else total
         
-        success, total = 0, 0
+        if((batch_size or PDFGenerator.BATCH_SIZE) > 1 and PDFGenerator.backend != 'weasyprint'):
+            ERROR_LOG.write_info(f"Batches of {batch_size} slips need weasyprint, '{PDFGenerator.backend}' renders one slip at a time")
+            queue.put((0, total_task))
+            return
         
-        for i in result:
-            status, _ = i
-            if(status): success+=1
-            total += 1
+        # each shard only checksums the pdfs of its own rows, a streamed sheet is a single shard
+        finished = Manifest.finished(dropzone, set(Schema.display(self.servitor[self.identification_rosette]).map(text_clean)) if tomes is None else None) if resume else set()
+        resumed = 0
+        counted = 0
+        progress = Progress(queue, total_task, shard)
+        self.load_scriptures()
         
-        return success, total
+        def volumes() -> Generator[pd.DataFrame, None, None]:
+            """ Blocks of rows to print, tomes streamed from a sheet or the servitor split into RENDER_ROWS """
+            nonlocal counted
+            
+            if(tomes is None):
+                blocks: Iterable[pd.DataFrame] = (self.servitor.iloc[start:start+PandaWrapper.RENDER_ROWS] for start in range(0, self.servitor.shape[0], PandaWrapper.RENDER_ROWS))
+            else:
+                blocks = tomes
+            
+            for block in blocks:
+                counted += block.shape[0]
+                yield block
+        
+        def scriptures() -> Generator[dict[str, str], None, None]:
+            """ Projects every row an earlier run has not finished """
+            nonlocal resumed
+            
+            for block in volumes():
+                for emp_data in self.recite(block, month=month.capitalize(), year=str(year)):
+                    if(emp_data.get(CODE_COL,"none") in finished):
+                        resumed += 1
+                        progress.skip()
+                        continue
+                    
+                    yield emp_data
+        
+        def scrolls() -> Generator[tuple[str, str], None, None]:
+            """ Renders the html of a block of rows at a time so the pool is fed as fast as it renders """
+            nonlocal resumed
+            
+            if(self.pdf.chosen_html is None): return
+            
+            extra = {'month':month.capitalize(),'year': str(year)}
+            
+            for block in volumes():
+                ids = Schema.display(block[self.identification_rosette]).map(text_clean)
+                pending = ~ids.isin(finished)
+                skipped = int((~pending).sum())
+                
+                if(skipped):
+                    resumed += skipped
+                    progress.skip(skipped)
+                
+                htmls = self.pdf.render_columns(self.pdf.chosen_html, self.transcribe(block[pending.to_numpy()], **extra), int(pending.sum()))
+                
+                yield from zip(ids[pending].tolist(), htmls)
+        
+        layout = self.pdf.load_layout(self.pdf.chosen_html) if (PDFGenerator.backend == 'native' and self.pdf.chosen_html is not None) else {}
+        
+        if(PDFGenerator.backend == 'native' and not layout):
+            ERROR_LOG.write_info(f"'{self.pdf.chosen_html}' has no section layout, falling back to wkhtmltopdf")
+            PDFGenerator.backend = 'wkhtmltopdf'
+        
+        if(layout):
+            task_completed, _ = PDFGenerator.stencil_many_pdf(json.dumps(layout), scriptures(), dropzone, Manifest(dropzone, shard), progress, SlipWriter(layout))
+        elif(PDFGenerator.backend == 'overlay'):
+            if(self.pdf.chosen_html is not None and (template := self.pdf.load_file(self.pdf.html_path, self.pdf.chosen_html)) is not None):
+                if(sample is None and tomes is None): sample = self.widest(month=month.capitalize(), year=str(year))
+                task_completed, _ = PDFGenerator.stencil_many_pdf(template, scriptures(), dropzone, Manifest(dropzone, shard), progress, sample=sample)
+        else:
+            task_completed, _ = run(PDFGenerator.render_pool(scrolls(), dropzone, pool_size, batch_size, Manifest(dropzone, shard), progress))
+
+        progress.emit()
+        queue.put((task_completed + resumed, total_task if tomes is None else counted))
     
-    def litany_of_scrolls(self, queue: Queue, dropzone:Path, month:MonthList, year:int):
-        """ Oh holy generator, grants us the sacred ink of thou's blessed blood (BulkPrint Process)"""
-        task_completed = 0
+    def litany_of_streams(self, queue: Queue, source: Path, dropzone:Path, month:MonthList, year:int, sheet: NullStr = None, skip: int = 0, password: str = '', decrypted_bytes: Optional[bytes] = None, pool_size: Optional[int] = None, batch_size: Optional[int] = None, backend: NullStr = None):
+        """ The scrolls are inked while the tome is still being read (Streaming BulkPrint Process)"""
+        content: Path | bytes = source if decrypted_bytes is None else decrypted_bytes
+        stream: Optional[SheetStream] = None
+        
+        try:
+            if(password and decrypted_bytes is None):
+                with io.BytesIO() as decrypted:
+                    success, file = Decryption.decrypting_file(source, decrypted, password)
+                    
+                    if(not success):
+                        queue.put((0, 0))
+                        return
+                    
+                    content = file.getvalue()
+            
+            stream = SheetStream(content, sheet, skip, PandaWrapper.RENDER_ROWS, as_text=isinstance(content, bytes))
+            
+            if((rosette := ColumnIndex(stream.columns).find(self.identification_rosette)) is None):
+                ERROR_LOG.write_info(f"'{self.identification_rosette}' column was not found in '{source}'")
+                queue.put((0, 0))
+                return
+            
+            self.servitor = pd.DataFrame(columns=stream.columns)
+            self.columns = {j:i for i,j in enumerate(stream.columns)}
+            self.identification_rosette = rosette
+            
+            self.litany_of_scrolls(queue, dropzone, month, year, pool_size, batch_size, backend, tomes=stream, total=stream.estimate)
+            
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            queue.put((0, 0))
+            
+        finally:
+            if(stream is not None): stream.close()
+        
+    def litany_of_heralds(self, queue: Queue, month:MonthList, year:int, email_col:str, dropzone: Optional[Path] = None, pool_size: Optional[int] = None, backend: NullStr = None):
+        """ Let the astropaths carry each scroll the moment it is inked (Print and Mail Process)"""
+        if(backend in PDFGenerator.BACKENDS): PDFGenerator.backend = backend
         total_task = self.servitor.shape[0]
-        tasks = []
+        progress = Progress(queue, total_task)
+        mailer = MailingWrapper().change_state(month, year)
         self.load_scriptures()
         
-        for data in self.servitor.itertuples(index=False):
-            emp_data = {key: val or "-" if (val not in set(self.columns.keys())) else text_clean(data[self.columns[val]]) for key,val in self.column_auspex.items()}
-            emp_data.update({'month':month.capitalize(),'year': str(year)})
+        def heralds() -> Generator[tuple[str, str, str], None, None]:
+            emails = Schema.display(self.servitor[email_col]).map(text_clean)
             
-            if(self.pdf.chosen_html is not None):
-                html_content = self.pdf.render_html(self.pdf.chosen_html, emp_data)
+            for emp_data, email in zip(self.recite(month=month.capitalize(), year=str(year)), emails):
+                if(self.pdf.chosen_html is not None):
+                    html_content = self.pdf.render_html(self.pdf.chosen_html, emp_data)
                     
-                tasks.append(PDFGenerator.generate_many_pdf(emp_data.get(CODE_COL,"none"), html_content,dropzone))
+                    yield emp_data.get(CODE_COL,"none"), email, html_content
+        
+        async def astropathic_choir() -> tuple[int, int]:
+            email_server = await AsyncMailing(**MAIL_CRED,error_log=ERROR_LOG).login()
             
-        task_completed, _ = run(PandaWrapper.get_success(tasks)) # type: ignore
-
+            try:
+                return await mailer.dispatch(heralds(), email_server, dropzone, pool_size, progress)
+            finally:
+                await email_server.destroy()
+        
+        task_completed = 0
+        
+        try:
+            task_completed, _ = run(astropathic_choir())
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+        
+        progress.emit()
         queue.put((task_completed, total_task))
         
-    def litany_of_scroll(self, queue: Queue, data_slate_path:Path, month:str, year:int, emp_id:str):
+    def litany_of_scroll(self, queue: Queue, data_slate_path:Path, month:str, year:int, emp_id:str, backend: NullStr = None):
         """ Oh holy generator, grants us the sacred ink of thou's blessed blood (SinglePrint Process)"""
+        if(backend in PDFGenerator.BACKENDS): PDFGenerator.backend = backend
         
-        search_result = self.servitor[self.servitor[self.identification_rosette]==emp_id]
+        search_result = self.servitor[(Schema.display(self.servitor[self.identification_rosette])==emp_id).to_numpy()]
         self.load_scriptures()
         
         
         if(not search_result.empty):
-            data = search_result.iloc[0].to_numpy()
-            emp_data = {key: val or "-" if (val not in set(self.columns.keys())) else text_clean(data[self.columns[val]]) for key,val in self.column_auspex.items()}
-            emp_data.update({'month':month.capitalize(),'year': str(year)})
+            emp_data = next(self.recite(search_result.iloc[[0]], month=month.capitalize(), year=str(year)))
             
             if self.pdf.chosen_html is not None:
                 html_content = self.pdf.render_html(self.pdf.chosen_html, emp_data)
@@ -765,6 +2338,7 @@ class TemplateGenerator:
         TemplateGenerator.counter = 0
         memo: dict[str, str] = {}
         jsonDict: dict[int, str] = {}
+        layout: dict[str, list[list[str]]] = {}
         
         for sheet in TEMPLATE_SHEET:
             sheetName = sheet.strip().replace(" ","_")
@@ -779,12 +2353,16 @@ class TemplateGenerator:
             columns = sheetData.columns
             column_memo = {j: i for i,j in enumerate(columns)}
             
-            if(((name := mapping(columns, _name)) is not None) and ((title := mapping(columns, _title)) is not None)):
+            index = ColumnIndex(columns)
+            
+            if(((name := index.find(_name)) is not None) and ((title := index.find(_title)) is not None)):
                 row_data = sheetData.to_numpy()
                 
-                memo[sheetName], tempDict = TemplateGenerator.make_everything({row[column_memo[name]]: row[column_memo[title]] for row in row_data})
+                rows = {row[column_memo[name]]: row[column_memo[title]] for row in row_data}
+                memo[sheetName], tempDict = TemplateGenerator.make_everything(rows)
             
                 jsonDict.update(tempDict)
+                layout[sheetName] = [[str(label), str(key)] for label, key in zip(rows, tempDict)]
             
         html_string = TEMPLATE % memo
         file_name = file_name.replace(" ", "_")
@@ -792,6 +2370,7 @@ class TemplateGenerator:
         queue.put((status, msg))
         status, msg = PDF_TEMPLATE._load_defaults(PDF_TEMPLATE.json_path, 'json', **{file_name: json.dumps(jsonDict)})
         queue.put((status, msg))
+        PDF_TEMPLATE._load_defaults(PDF_TEMPLATE.layout_path, 'json', **{file_name: json.dumps(layout)})
     
     @staticmethod
     def make_excel(file_name: Path, data: dict[str, pd.DataFrame], queue: Queue) -> None:
@@ -809,7 +2388,9 @@ class TemplateGenerator:
             columns = sheetData.columns
             column_memo = {j: i for i,j in enumerate(columns)}
             
-            if(((_ := mapping(columns, _name)) is not None) and ((title := mapping(columns, _title)) is not None)):
+            index = ColumnIndex(columns)
+            
+            if(((_ := index.find(_name)) is not None) and ((title := index.find(_title)) is not None)):
                 row_data = sheetData.to_numpy()
                 
                 for row in row_data:
@@ -1150,7 +2731,9 @@ class SendBulkMail(BaseTemplate):
             return
                 
         if(self.can_start_thread()):
-            self.process = Process(target=MailingWrapper().change_state(month,year).massMail,kwargs={'data': BaseTemplate.data,'code_column': code_col,'email_col': email_col,'dir_path': file_path,'queue':self.QUEUE},daemon=True)
+            handle = SharedFrame.publish(BaseTemplate.data)
+            self.process = Process(target=MailingWrapper().change_state(month,year).massMail,kwargs={'data': handle,'code_column': code_col,'email_col': email_col,'dir_path': file_path,'queue':self.QUEUE},daemon=True)
+            SharedFrame.pin(handle, self.process)
             self.thread = Thread(target=self.send_mail_thread_wrapper,daemon=True)
             
             self.thread.start()
@@ -1578,7 +3161,7 @@ class DataPreview(BaseTemplate):
                 GUI_Handler.setOptions(htmls,self.outer.CHILD[DataView.__name__].html_list,self.outer.CHILD[DataView.__name__].html) # type: ignore
                 
                 if(unique_col is not None):
-                    BaseTemplate.data = table
+                    BaseTemplate.data = Schema.classify(table).compact(table)
                     self.outer.CHILD[DataView.__name__].id_column = unique_col # type: ignore
                     self.switch_screen(DataView)
                     tkmb.showinfo('Fetch Status','Data Fetched Successfully')
@@ -1632,6 +3215,8 @@ class DataView(BaseTemplate):
     id_column: NullStr = None
     html = ctk.StringVar(value="index.html")
     json = ctk.StringVar(value="index.json")
+    engine = ctk.StringVar(value=PDFGenerator.backend)
+    batch = ctk.StringVar(value=str(PDFGenerator.BATCH_SIZE))
     
     def __init__(self,outer:App):
 
@@ -1657,22 +3242,43 @@ class DataView(BaseTemplate):
         
         frame = ctk.CTkFrame(master=self.frame, fg_color=COLOR_SCHEME["fg_color"])
         ctk.CTkLabel(master=frame, text="Template HTML:", text_color=COLOR_SCHEME["text_color"], font=("Ubuntu", 16, "bold")).pack(padx=10,pady=10,side='left')
-        self.html_list = ctk.CTkOptionMenu(master=frame,variable=self.html,values=[],button_color=COLOR_SCHEME["button_color"],fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=200)
+        self.html_list = ctk.CTkOptionMenu(master=frame,variable=self.html,values=[],command=self.template_chosen,button_color=COLOR_SCHEME["button_color"],fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=200)
         self.html_list.pack(padx=10,pady=10,side='left')
         frame.pack()
         
         frame = ctk.CTkFrame(master=self.frame, fg_color=COLOR_SCHEME["fg_color"])
         ctk.CTkLabel(master=frame, text="Mapping JSON:", text_color=COLOR_SCHEME["text_color"], font=("Ubuntu", 16, "bold")).pack(padx=10,pady=10,side='left')
-        self.json_list = ctk.CTkOptionMenu(master=frame,variable=self.json,values=[],button_color=COLOR_SCHEME["button_color"],fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=200)
+        self.json_list = ctk.CTkOptionMenu(master=frame,variable=self.json,values=[],command=self.template_chosen,button_color=COLOR_SCHEME["button_color"],fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=200)
         self.json_list.pack(padx=10,pady=10,side='left')
         frame.pack()
         
+        frame = ctk.CTkFrame(master=self.frame, fg_color=COLOR_SCHEME["fg_color"])
+        ctk.CTkLabel(master=frame, text="PDF Engine:", text_color=COLOR_SCHEME["text_color"], font=("Ubuntu", 16, "bold")).pack(padx=10,pady=10,side='left')
+        self.engine_list = ctk.CTkOptionMenu(master=frame,variable=self.engine,values=list(PDFGenerator.BACKENDS),button_color=COLOR_SCHEME["button_color"],fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=200)
+        self.engine_list.pack(padx=10,pady=10,side='left')
+        frame.pack()
+        
+        frame = ctk.CTkFrame(master=self.frame, fg_color=COLOR_SCHEME["fg_color"])
+        ctk.CTkLabel(master=frame, text="Slips per Render:", text_color=COLOR_SCHEME["text_color"], font=("Ubuntu", 16, "bold")).pack(padx=10,pady=10,side='left')
+        self.batch_list = ctk.CTkOptionMenu(master=frame,variable=self.batch,values=["1","4","8","16","32"],button_color=COLOR_SCHEME["button_color"],fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=200)
+        self.batch_list.pack(padx=10,pady=10,side='left')
+        frame.pack()
+        
         self.single_print = ctk.CTkButton(master=self.frame , text="Generate Single PDF", command=self.single_print_pdf_cover, fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=250)
         self.single_print.pack(pady=10)
         
         self.bulk_print = ctk.CTkButton(master=self.frame , text="Bulk Print PDFs", command=self.bulk_print_pdfs_cover, fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=250)
         self.bulk_print.pack(pady=10)
         
+        self.resume_print = ctk.CTkButton(master=self.frame , text="Resume Bulk Print", command=lambda: self.bulk_print_pdfs_cover(resume=True), fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=250)
+        self.resume_print.pack(pady=10)
+        
+        self.print_mail = ctk.CTkButton(master=self.frame , text="Bulk Print and Mail", command=self.print_and_mail_cover, fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=250)
+        self.print_mail.pack(pady=10)
+        
+        self.print_excel = ctk.CTkButton(master=self.frame , text="Bulk Print from Excel", command=self.bulk_print_excel_cover, fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=250)
+        self.print_excel.pack(pady=10)
+        
         self.back = ctk.CTkButton(master=self.frame , text='Back', command=self.back_to_preview, fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=250)
         self.back.pack(pady=10, padx=10)
         
@@ -1698,6 +3304,7 @@ class DataView(BaseTemplate):
 
         self.text_excel.configure(xscrollcommand=x_scrollbar.set)
         self.quit = ctk.CTkButton(master=self.frame, text='Quit the Process',command=self.stop_pdf_thread, fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=250)
+        self.progress = ctk.CTkLabel(master=self.frame, text="", text_color=COLOR_SCHEME["text_color"], font=("Ubuntu", 16, "bold"),width=250)
         self.to_disable = list(self.get_widgets_to_disable())
 
     # back to interface
@@ -1736,10 +3343,10 @@ class DataView(BaseTemplate):
             tkmb.showwarning("Data Error", "Data was not found")
             return
         
-        search_result = BaseTemplate.data[BaseTemplate.data[str(self.id_column)]==emp_id]
+        search_result = BaseTemplate.data[(Schema.display(BaseTemplate.data[str(self.id_column)])==emp_id).to_numpy()]
         
         if(not search_result.empty): 
-            pyperclip.copy(','.join(map(text_clean,search_result.iloc[[0]].to_numpy())))
+            pyperclip.copy(','.join(map(text_clean,Schema.text(search_result.iloc[[0]]).to_numpy())))
             tkmb.showinfo("ClipBoard Status", "Employee data copied to clipboard.")
         else:
             tkmb.showwarning("Error", "Employee ID was not found.")
@@ -1794,6 +3401,7 @@ class DataView(BaseTemplate):
         self.cancel_thread()
         GUI_Handler.unlock_gui_button(self.to_disable)
         GUI_Handler.remove_widget(self.quit)
+        GUI_Handler.remove_widget(self.progress)
         
         tkmb.showinfo('Process Status','PDF Generation Cancelled')
 
@@ -1832,7 +3440,9 @@ class DataView(BaseTemplate):
             if(self.can_start_thread()):
                 PDF_TEMPLATE.chosen_json = json
                 PDF_TEMPLATE.chosen_html = html
-                self.process = Process(target=PandaWrapper(BaseTemplate.data,str(self.id_column),PDF_TEMPLATE).litany_of_scroll,kwargs={'queue':self.QUEUE,'data_slate_path': Path(file),'month': month,'year': year,'emp_id': emp_id},daemon=True)
+                handle = SharedFrame.publish(BaseTemplate.data)
+                self.process = Process(target=PandaWrapper(handle,str(self.id_column),PDF_TEMPLATE).litany_of_scroll,kwargs={'queue':self.QUEUE,'data_slate_path': Path(file),'month': month,'year': year,'emp_id': emp_id,'backend': self.engine.get()},daemon=True)
+                SharedFrame.pin(handle, self.process)
                 self.thread = Thread(target=self.single_pdf_thread,daemon=True)
                 self.process.start()
                 self.thread.start()
@@ -1844,35 +3454,118 @@ class DataView(BaseTemplate):
             tkmb.showerror("File Error","File was not found")
             
                         
-    def bulk_print_pdfs_thread(self) -> None:
+    def bulk_print_pdfs_thread(self, verb: str = "Generated") -> None:
         
         GUI_Handler.lock_gui_button(self.to_disable)
         GUI_Handler.place_after(self.bulk_print,self.quit)
+        GUI_Handler.changeText(self.progress, "Starting...")
+        GUI_Handler.place_after(self.quit,self.progress)
         done:int = 0
         total:int = 0
+        waiting:int = len(self.shards)
+        events: dict[int, PROGRESS] = {}
+        last_event = shown = time.monotonic()
         
-        while True:
+        while waiting:
             
             if(self.stop_flag): return None
             
             if(not self.QUEUE.empty()):
                 hot = self.QUEUE.get()
                 
+                if(isinstance(hot, dict)):
+                    events[hot["shard"]] = hot # type: ignore
+                    last_event = time.monotonic()
+                    continue
+                
                 if(isinstance(hot, tuple) and len(hot)==2):
-                    done, total = hot
+                    done, total = done + hot[0], total + hot[1]
                     
-                self.clear_queue()
+                waiting -= 1
+                
+            elif(not any(shard.is_alive() for shard in self.shards)):
                 break
+            
+            if(events and time.monotonic() - shown >= Progress.INTERVAL):
+                shown = time.monotonic()
+                GUI_Handler.changeText(self.progress, Progress.describe(events.values(), shown - last_event))
+        
+        self.clear_queue()
+        GUI_Handler.remove_widget(self.progress)
                 
         if((not self.stop_flag) and total):
-            tkmb.showinfo('Bulk PDF Status',f"Generated {done} PDFs out of {total} records")
+            tkmb.showinfo('Bulk PDF Status',f"{verb} {done} PDFs out of {total} records")
         elif(not self.stop_flag):
             tkmb.showwarning('Bulk PDF Status',f"No PDFs were generated")
             
         GUI_Handler.unlock_gui_button(self.to_disable)
         GUI_Handler.remove_widget(self.quit)
         
-    def bulk_print_pdfs_cover(self) -> None:
+    def template_report(self, columns: Optional[list[str]] = None) -> Optional[TEMPLATE_REPORT]:
+        """ Validates the chosen html and json against the data (or the given columns), None when there is nothing to check against """
+        
+        if(columns is None and isinstance(BaseTemplate.data, pd.DataFrame)):
+            columns = list(BaseTemplate.data.columns)
+        
+        if(PDF_TEMPLATE.chosen_html is None or PDF_TEMPLATE.chosen_json is None or columns is None):
+            return None
+        
+        index = ColumnIndex(columns)
+        report = PDF_TEMPLATE.validate(PDF_TEMPLATE.chosen_html, PDF_TEMPLATE.chosen_json, index.find, ('month', 'year', CODE_COL, 'branch'))
+        
+        if(not report['ok']):
+            ERROR_LOG.write_info(f"Template check for '{PDF_TEMPLATE.chosen_html}': {json.dumps(report)}")
+        
+        return report
+    
+    @staticmethod
+    def template_problems(report: TEMPLATE_REPORT) -> list[str]:
+        problems: list[str] = []
+        
+        if(report['unmapped']):
+            problems.append(f"Placeholders missing from the json: {', '.join(report['unmapped'])}")
+        
+        if(report['missing_columns']):
+            problems.append(f"Columns missing from the data: {', '.join(text_clean(i) for i in report['missing_columns'].values())}")
+        
+        return problems
+    
+    def template_chosen(self, _value: Optional[str] = None) -> None:
+        """ Checks the template and mapping as soon as either is picked, so problems show up before a job is started """
+        
+        PDF_TEMPLATE.chosen_html = Path(self.html.get())
+        PDF_TEMPLATE.chosen_json = Path(self.json.get())
+        
+        if((report := self.template_report()) is None or report['ok']): return
+        
+        if(report['errors']):
+            tkmb.showerror('Template Check', '\n\n'.join(report['errors']))
+        else:
+            tkmb.showwarning('Template Check', '\n\n'.join(self.template_problems(report)) + '\n\nMissing values will print as "None" or "-".')
+    
+    def template_check(self, columns: Optional[list[str]] = None) -> bool:
+        """ Validates the chosen html and json before a bulk job, refuses a missing template and asks whether to go on if they disagree """
+        
+        if((report := self.template_report(columns)) is None): return False
+        
+        if(report['ok']): return True
+        
+        if(report['errors']):
+            tkmb.showerror('Template Check', '\n\n'.join(report['errors']))
+            return False
+        
+        return tkmb.askyesno('Template Check', '\n\n'.join(self.template_problems(report)) + '\n\nMissing values will print as "None" or "-". Continue anyway?')
+    
+    def batch_check(self) -> bool:
+        """ Batches are split back into slips page by page, which only weasyprint output allows """
+        
+        if(int(self.batch.get()) > 1 and self.engine.get() != 'weasyprint'):
+            tkmb.showerror('Engine Status', f"{self.batch.get()} slips per render needs the weasyprint engine, '{self.engine.get()}' renders one slip at a time")
+            return False
+        
+        return True
+    
+    def bulk_print_pdfs_cover(self, resume: bool = False) -> None:
                 
         month = self.chosen_month
         year = self.chosen_year
@@ -1893,14 +3586,166 @@ class DataView(BaseTemplate):
 
         if where is None:
             tkmb.showerror('Program Status',f"File path was invalid")
+            
+        if(not isinstance(BaseTemplate.data, pd.DataFrame)):
+            tkmb.showerror("Data Error","Data is Unavailable")
+            return
 
         if(self.can_start_thread()):
             PDF_TEMPLATE.chosen_html = Path(html)
             PDF_TEMPLATE.chosen_json = Path(json)
-            self.process = Process(target=PandaWrapper(BaseTemplate.data,str(self.id_column),PDF_TEMPLATE).litany_of_scrolls,kwargs={'queue': self.QUEUE,'dropzone': where,'month': month,'year': year},daemon=True)
+            
+            if(not self.template_check() or not self.batch_check()): return
+            handle = SharedFrame.publish(BaseTemplate.data)
+            shards = PandaWrapper.shard(handle)
+            pool_size = max(1, PDFGenerator.POOL_SIZE // len(shards))
+            
+            if(not resume): Manifest.reset(where)
+            
+            sample: Optional[dict[str, str]] = None
+            
+            if(self.engine.get() == 'overlay'):
+                # laid out once over the whole sheet, a sample per shard would give each shard its own layout
+                wrapper = PandaWrapper(BaseTemplate.data,str(self.id_column),PDF_TEMPLATE)
+                wrapper.load_scriptures()
+                sample = wrapper.widest(month=month.capitalize(), year=str(year))
+            
+            self.shards = [Process(target=PandaWrapper(shard,str(self.id_column),PDF_TEMPLATE).litany_of_scrolls,kwargs={'queue': self.QUEUE,'dropzone': where,'month': month,'year': year,'pool_size': pool_size,'batch_size': int(self.batch.get()),'backend': self.engine.get(),'shard': idx,'resume': resume,'sample': sample},daemon=True) for idx, shard in enumerate(shards)]
+            SharedFrame.pin(handle, *self.shards)
+            self.thread = Thread(target=self.bulk_print_pdfs_thread,daemon=True)
+            
+            for process in self.shards: process.start()
+            self.thread.start()
+            
+        else:
+            tkmb.showerror('Program Status',f"Warning Background Process/Thread is still running")
+            
+    def bulk_print_excel_cover(self) -> None:
+        """ Bulk prints straight from a workbook laid out like this table, slips are made while the sheet is still being read """
+        
+        month = self.chosen_month
+        year = self.chosen_year
+        institute = self.chosen_institute
+        type = self.chosen_type
+        json = self.json.get()
+        html = self.html.get()
+        password = ''
+        
+        file_path = filedialog.askopenfilename(filetypes=[("Excel Files", ".xlsx")],initialdir=Path(APP_PATH).parent)
+        
+        if(not file_path):
+            tkmb.showerror('File Status',f"Empty file_path was detected")
+            return
+        
+        try:
+            with open(file_path, 'rb') as f:
+                encrypted = Decryption.is_encrypted(f)
+                
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            tkmb.showerror('File Status',f"File '{file_path}' could not be read")
+            return
+        
+        if(encrypted):
+            password = ctk.CTkInputDialog(text="Enter Password for File:", title="Encrypted File").get_input() or ''
+            
+            if(not password):
+                tkmb.showinfo('Encryption Status',f"File '{file_path}' is encrypted. Please enter the password")
+                return
+        
+        sheet = (ctk.CTkInputDialog(text="Sheet to print (leave empty for the first sheet):", title="Sheet").get_input() or '').strip()
+        header = (ctk.CTkInputDialog(text="Row with the column names (0 is the first row):", title="Header Row").get_input() or '').strip()
+        
+        try:
+            where = Path(APP_PATH).parent.joinpath('pdfs', institute, type, year, month)
+            os.makedirs(where.resolve(), exist_ok=True)
+            
+        except OSError as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            tkmb.showerror('Program Status',f"File path was invalid")
+            return
+        
+        if(not self.batch_check()): return
+        
+        skip = int(header) if header.isdigit() else 0
+        decrypted_bytes = DecryptionCache.recall(Path(file_path), password) if password else None
+        
+        try:
+            if(password and decrypted_bytes is None):
+                with io.BytesIO() as decrypted:
+                    success, file = Decryption.decrypting_file(Path(file_path), decrypted, password)
+                    
+                    if(not success):
+                        tkmb.showwarning('File Status',f"Excel File '{file_path}' could not be decrypted. Please check the password")
+                        return
+                    
+                    decrypted_bytes = file.getvalue()
+                    DecryptionCache.keep(Path(file_path), password, decrypted_bytes)
+            
+            # only the header row is read here, so the template is checked against what the stream will see
+            stream = SheetStream(decrypted_bytes if decrypted_bytes is not None else Path(file_path), sheet or None, skip, 1)
+            columns = stream.columns
+            stream.close()
+            
+        except Exception as e:
+            ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+            tkmb.showerror('File Status',f"Sheet '{sheet or 'first'}' of '{file_path}' could not be read")
+            return
+        
+        if(self.can_start_thread()):
+            PDF_TEMPLATE.chosen_html = Path(html)
+            PDF_TEMPLATE.chosen_json = Path(json)
+            
+            if(not self.template_check(columns)): return
+            Manifest.reset(where)
+            
+            self.shards = [Process(target=PandaWrapper(pd.DataFrame(),str(self.id_column),PDF_TEMPLATE).litany_of_streams,kwargs={'queue': self.QUEUE,'source': Path(file_path),'dropzone': where,'month': month,'year': year,'sheet': sheet or None,'skip': skip,'password': password,'decrypted_bytes': decrypted_bytes,'pool_size': PDFGenerator.POOL_SIZE,'batch_size': int(self.batch.get()),'backend': self.engine.get()},daemon=True)]
             self.thread = Thread(target=self.bulk_print_pdfs_thread,daemon=True)
             
-            self.process.start()
+            for process in self.shards: process.start()
+            self.thread.start()
+            
+        else:
+            tkmb.showerror('Program Status',f"Warning Background Process/Thread is still running")
+    
+    def print_and_mail_cover(self) -> None:
+        
+        month = self.chosen_month
+        year = self.chosen_year
+        json = self.json.get()
+        html = self.html.get()
+        where: Optional[Path] = None
+        
+        if(not isinstance(BaseTemplate.data, pd.DataFrame)):
+            tkmb.showerror("Data Error","Data is Unavailable")
+            return
+        
+        email_col = next((i for i in BaseTemplate.data.columns if "mail" in str(i).lower()), None)
+        
+        if(email_col is None):
+            tkmb.showwarning('Column Missing','Mail Column was not found')
+            return
+        
+        if(tkmb.askyesno('Print and Mail','Also save a copy of every PDF in the pdfs folder?')):
+            try:
+                where = Path(APP_PATH).parent.joinpath('pdfs', self.chosen_institute, self.chosen_type, year, month)
+                os.makedirs(where.resolve(), exist_ok=True)
+            except OSError as e:
+                ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+                where = None
+        
+        if(self.can_start_thread()):
+            PDF_TEMPLATE.chosen_html = Path(html)
+            PDF_TEMPLATE.chosen_json = Path(json)
+            
+            if(not self.template_check()): return
+            
+            handle = SharedFrame.publish(BaseTemplate.data)
+            self.shards = [Process(target=PandaWrapper(handle,str(self.id_column),PDF_TEMPLATE).litany_of_heralds,kwargs={'queue': self.QUEUE,'month': month,'year': year,'email_col': email_col,'dropzone': where,'backend': self.engine.get()},daemon=True)]
+            SharedFrame.pin(handle, *self.shards)
+            self.thread = Thread(target=self.bulk_print_pdfs_thread,kwargs={'verb': 'Mailed'},daemon=True)
+            
+            for process in self.shards: process.start()
             self.thread.start()
             
         else:
@@ -1936,6 +3781,9 @@ class FileInput(BaseTemplate):
         self.browse_button = ctk.CTkButton(master=self.frame , text="Browse", command=self.select_file, fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=250)
         self.browse_button.pack(pady=10)
         
+        self.folder_button = ctk.CTkButton(master=self.frame , text="Load Folder", command=self.select_folder, fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=250)
+        self.folder_button.pack(pady=10)
+        
         self.upload_button = ctk.CTkButton(master=self.frame , text="Upload", command=self.load_decrypted_file, fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=250)
         self.back = ctk.CTkButton(master=self.frame , text='Back', command=self.back_to_interface, fg_color=COLOR_SCHEME["button_color"], font=("Ubuntu", 16, "bold"),width=250)
         self.back.pack(pady=10, padx=10)
@@ -2010,7 +3858,7 @@ class FileInput(BaseTemplate):
             tkmb.showerror('Program Status',f"Warning Background Thread is still running")
         
     def _go_to_upload_thread(self):
-        GUI_Handler.view_excel(BaseTemplate.data[self.sheet.get()],self.outer.CHILD[UploadData.__name__].text_excel)        
+        GUI_Handler.view_excel(self.load_sheet(self.sheet.get()),self.outer.CHILD[UploadData.__name__].text_excel)        
         self.outer.CHILD[UploadData.__name__].sheet = self.sheet.get()
         self.switch_screen(UploadData)
         
@@ -2020,7 +3868,7 @@ class FileInput(BaseTemplate):
         GUI_Handler.remove_widget(self.quit)
         
     def next_row(self):
-        max_row = BaseTemplate.data[self.sheet.get()].shape[0]
+        max_row = self.rows
         
         self.row_index = min(max_row, self.row_index+1)
         
@@ -2044,12 +3892,18 @@ class FileInput(BaseTemplate):
         file_path = self.file.get()
         password = self.prev_password
         
+        if(isinstance(BaseTemplate.data, (Workbook, Ledger))):
+            # the grid is already loaded, only the header row moves
+            BaseTemplate.data = BaseTemplate.data.reheader(self.row_index)
+            self.changeView()
+            return
+        
         if(file_path):
             
             if(self.encryption and password):                
                 if(self.can_start_thread()):
                     self.thread = Thread(target=self.change_row_thread,daemon=True)
-                    self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index},daemon=True)
+                    self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index,'decrypted_bytes': DecryptionCache.recall(Path(file_path), password)},daemon=True)
                     self.thread.start()
                     self.process.start()
                     
@@ -2146,6 +4000,55 @@ class FileInput(BaseTemplate):
         GUI_Handler.remove_widget(self.quit)
         
         
+    def select_folder(self) -> None:
+        """ Loads every workbook of a folder together, a password is asked for each encrypted one """
+        folder = filedialog.askdirectory(initialdir=Path(APP_PATH).parent)
+        
+        if(not folder): return
+        
+        if(not self.can_start_thread()):
+            tkmb.showerror('Program Status',f"Warning Background Process/Thread is still running")
+            return
+        
+        passwords: dict[str, str] = {}
+        
+        for file_path in Decryption.workbooks(Path(folder)):
+            try:
+                with open(file_path.resolve(), 'rb') as f:
+                    encrypted = Decryption.is_encrypted(f)
+            except Exception as e:
+                ERROR_LOG.write_error(ERROR_LOG.get_error_info(e))
+                continue
+            
+            if(encrypted and (password := ctk.CTkInputDialog(text=f"Password for '{file_path.name}' (leave empty to skip it):", title="Encrypted File").get_input())):
+                passwords[file_path.name] = password
+        
+        self.thread = Thread(target=self.load_folder_thread,kwargs={'folder': Path(folder),'passwords': passwords},daemon=True)
+        self.thread.start()
+    
+    def load_folder_thread(self, folder: Path, passwords: dict[str, str]) -> None:
+        GUI_Handler.lock_gui_button(self.to_disable)
+        GUI_Handler.place_after(self.browse_button,self.quit)
+        self.set_for_file_upload_state()
+        
+        data = Decryption.fetch_folder(folder, passwords, self.row_index)
+        
+        if(self.stop_flag): return None
+        
+        if(sheets := list(data)):
+            BaseTemplate.data = data
+            GUI_Handler.change_file_holder(self.file,str(folder))
+            GUI_Handler.setOptions(sheets,self.sheetList,self.sheet)
+            self.set_after_upload_state()
+            GUI_Handler.view_excel(self.load_sheet(sheets[0]),self.text_excel)
+            
+            tkmb.showinfo('Upload Status',f"{len(data.workbooks)} Excel Files from '{folder}' were loaded")
+        else:
+            tkmb.showwarning('File Status',f"No Excel File in '{folder}' could be loaded")
+        
+        GUI_Handler.unlock_gui_button(self.to_disable)
+        GUI_Handler.remove_widget(self.quit)
+    
     def select_file(self) -> None:
         file_path = filedialog.askopenfilename(filetypes=[("Excel Files", ".xlsx;.xls")],initialdir=Path(APP_PATH).parent)
 
@@ -2187,7 +4090,7 @@ class FileInput(BaseTemplate):
             BaseTemplate.data = data
             GUI_Handler.setOptions(sheets,self.sheetList,self.sheet)
             self.set_after_upload_state()
-            GUI_Handler.view_excel(BaseTemplate.data[sheets[0]],self.text_excel)
+            GUI_Handler.view_excel(self.load_sheet(sheets[0]),self.text_excel)
             
             tkmb.showinfo('Upload Status',f"Excel File '{self.file.get()}' was loaded")
         else:
@@ -2237,9 +4140,11 @@ class FileInput(BaseTemplate):
             BaseTemplate.data = data
             GUI_Handler.setOptions(sheets,self.sheetList,self.sheet)
             self.set_after_upload_state()
-            GUI_Handler.view_excel(data[sheets[0]],self.text_excel)
+            GUI_Handler.view_excel(self.load_sheet(sheets[0]),self.text_excel)
             
             self.prev_password = self.password_box.get()
+            
+            DecryptionCache.keep(Path(self.file.get()), self.prev_password, data)
             tkmb.showinfo('Upload Status',f"Excel File '{self.file.get()}' was loaded")
         else:
             
@@ -2260,7 +4165,7 @@ class FileInput(BaseTemplate):
                 
             if(self.can_start_thread()):
                 self.thread = Thread(target=self.load_protected_data_thread,daemon=True)
-                self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index},daemon=True)
+                self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index,'decrypted_bytes': DecryptionCache.recall(Path(file_path), password)},daemon=True)
                 self.thread.start()
                 self.process.start()
             
@@ -2274,7 +4179,7 @@ class FileInput(BaseTemplate):
     def change_view_thread(self):
         GUI_Handler.lock_gui_button(self.to_disable)
         current_sheet = self.sheet.get()
-        current_data = BaseTemplate.data[current_sheet]
+        current_data = self.load_sheet(current_sheet)
         
         GUI_Handler.view_excel(current_data,self.text_excel)
         GUI_Handler.unlock_gui_button(self.to_disable)
@@ -2298,13 +4203,14 @@ class FileInput(BaseTemplate):
         if((current_sheet is not None) and (data is not None)):
             BaseTemplate.data = data
             self.set_after_upload_state()
-            GUI_Handler.view_excel(data[current_sheet],self.text_excel)
+            GUI_Handler.view_excel(self.load_sheet(current_sheet),self.text_excel)
             self.prev_password = self.password_box.get()
+            DecryptionCache.keep(Path(self.file.get()), self.prev_password, data)
         else:
             
             tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' could not be loaded. Please check the password")
         
-        GUI_Handler.view_excel(BaseTemplate.data[self.sheet.get()],self.text_excel)
+        GUI_Handler.view_excel(self.load_sheet(self.sheet.get()),self.text_excel)
         GUI_Handler.unlock_gui_button(self.to_disable)    
         GUI_Handler.remove_widget(self.quit)
         
@@ -2518,7 +4424,9 @@ class UploadData(BaseTemplate):
         if(year_check(year)):
             if(self.can_start_thread() and messagebox.askyesnocancel("Upload Confirmation", "Would you like it upload this data. Any pre-existing data will be updated. Are you sure about this?")):
                 self.thread = Thread(target=self.update_thread,daemon=True)
-                self.process = Process(target=DatabaseWrapper(**self.outer.CRED).fill_table,kwargs={'data':data,'queue': self.QUEUE,'institute': institute,'type': type,'year': year,'month': month},daemon=True)
+                handle = SharedFrame.publish(data)
+                self.process = Process(target=DatabaseWrapper(**self.outer.CRED).fill_table,kwargs={'data':handle,'queue': self.QUEUE,'institute': institute,'type': type,'year': year,'month': month},daemon=True)
+                SharedFrame.pin(handle, self.process)
                 self.thread.start()
                 self.process.start()
                 
@@ -2979,7 +4887,7 @@ class TemplateInput(BaseTemplate):
         GUI_Handler.remove_widget(self.quit)
         
     def next_row(self):
-        max_row = BaseTemplate.data[self.sheet.get()].shape[0]
+        max_row = self.rows
         
         self.row_index = min(max_row, self.row_index+1)
         
@@ -3003,12 +4911,18 @@ class TemplateInput(BaseTemplate):
         file_path = self.file.get()
         password = self.prev_password
         
+        if(isinstance(BaseTemplate.data, Workbook)):
+            # the grid is already loaded, only the header row moves
+            BaseTemplate.data = BaseTemplate.data.reheader(self.row_index)
+            self.changeView()
+            return
+        
         if(file_path):
             
             if(self.encryption and password):                
                 if(self.can_start_thread()):
                     self.thread = Thread(target=self.change_row_thread,daemon=True)
-                    self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index},daemon=True)
+                    self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index,'decrypted_bytes': DecryptionCache.recall(Path(file_path), password)},daemon=True)
                     self.thread.start()
                     self.process.start()
                     
@@ -3149,14 +5063,18 @@ class TemplateInput(BaseTemplate):
                     tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' requires all the following sheets: {', '.join(TEMPLATE_SHEET)}")
                     return
                 
-                if(not all([checkColumns(_data.columns, TEMPLATE_COLUMN) for _data in data.values()])):
+                if((frames := self.load_sheets(sheets[::-1], data)) is None): # the first sheet goes last so it stays parsed for the view
+                    if(not self.stop_flag): tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' could not be loaded")
+                    return
+                
+                if(not all([checkColumns(_data.columns, TEMPLATE_COLUMN) for _data in frames.values()])):
                     tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' requires all the following columns in all sheets: {', '.join(TEMPLATE_COLUMN)}")
                     return
                 
                 BaseTemplate.data = data
                 GUI_Handler.setOptions(sheets,self.sheetList,self.sheet)
                 self.set_after_upload_state()
-                GUI_Handler.view_excel(BaseTemplate.data[sheets[0]],self.text_excel)
+                GUI_Handler.view_excel(self.load_sheet(sheets[0]),self.text_excel)
                 
                 tkmb.showinfo('Upload Status',f"Excel File '{self.file.get()}' was loaded")
             else:
@@ -3208,16 +5126,22 @@ class TemplateInput(BaseTemplate):
                     tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' requires all the following sheets: {', '.join(TEMPLATE_SHEET)}")
                     return
                 
-                if(not all([checkColumns(_data.columns, TEMPLATE_COLUMN) for _data in data.values()])):
+                if((frames := self.load_sheets(sheets[::-1], data)) is None): # the first sheet goes last so it stays parsed for the view
+                    if(not self.stop_flag): tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' could not be loaded")
+                    return
+                
+                if(not all([checkColumns(_data.columns, TEMPLATE_COLUMN) for _data in frames.values()])):
                     tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' requires all the following columns in all sheets: {', '.join(TEMPLATE_COLUMN)}")
                     return
                     
                 BaseTemplate.data = data
                 GUI_Handler.setOptions(sheets,self.sheetList,self.sheet)
                 self.set_after_upload_state()
-                GUI_Handler.view_excel(data[sheets[0]],self.text_excel)
+                GUI_Handler.view_excel(self.load_sheet(sheets[0]),self.text_excel)
                 
                 self.prev_password = self.password_box.get()
+                
+                DecryptionCache.keep(Path(self.file.get()), self.prev_password, data)
                 tkmb.showinfo('Upload Status',f"Excel File '{self.file.get()}' was loaded")
             else:
                 
@@ -3239,7 +5163,7 @@ class TemplateInput(BaseTemplate):
                 
             if(self.can_start_thread()):
                 self.thread = Thread(target=self.load_protected_data_thread,daemon=True)
-                self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index},daemon=True)
+                self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index,'decrypted_bytes': DecryptionCache.recall(Path(file_path), password)},daemon=True)
                 self.thread.start()
                 self.process.start()
             
@@ -3253,7 +5177,7 @@ class TemplateInput(BaseTemplate):
     def change_view_thread(self):
         GUI_Handler.lock_gui_button(self.to_disable)
         current_sheet = self.sheet.get()
-        current_data = BaseTemplate.data[current_sheet]
+        current_data = self.load_sheet(current_sheet)
         
         GUI_Handler.view_excel(current_data,self.text_excel)
         GUI_Handler.unlock_gui_button(self.to_disable)
@@ -3277,13 +5201,14 @@ class TemplateInput(BaseTemplate):
         if((current_sheet is not None) and (data is not None)):
             BaseTemplate.data = data
             self.set_after_upload_state()
-            GUI_Handler.view_excel(data[current_sheet],self.text_excel)
+            GUI_Handler.view_excel(self.load_sheet(current_sheet),self.text_excel)
             self.prev_password = self.password_box.get()
+            DecryptionCache.keep(Path(self.file.get()), self.prev_password, data)
         else:
             
             tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' could not be loaded. Please check the password")
         
-        GUI_Handler.view_excel(BaseTemplate.data[self.sheet.get()],self.text_excel)
+        GUI_Handler.view_excel(self.load_sheet(self.sheet.get()),self.text_excel)
         GUI_Handler.unlock_gui_button(self.to_disable)    
         GUI_Handler.remove_widget(self.quit)
         
@@ -3473,7 +5398,7 @@ class TemplateGeneration(BaseTemplate):
         GUI_Handler.remove_widget(self.quit)
         
     def next_row(self):
-        max_row = BaseTemplate.data[self.sheet.get()].shape[0]
+        max_row = self.rows
         
         self.row_index = min(max_row, self.row_index+1)
         
@@ -3497,12 +5422,18 @@ class TemplateGeneration(BaseTemplate):
         file_path = self.file.get()
         password = self.prev_password
         
+        if(isinstance(BaseTemplate.data, Workbook)):
+            # the grid is already loaded, only the header row moves
+            BaseTemplate.data = BaseTemplate.data.reheader(self.row_index)
+            self.changeView()
+            return
+        
         if(file_path):
             
             if(self.encryption and password):                
                 if(self.can_start_thread()):
                     self.thread = Thread(target=self.change_row_thread,daemon=True)
-                    self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index},daemon=True)
+                    self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index,'decrypted_bytes': DecryptionCache.recall(Path(file_path), password)},daemon=True)
                     self.thread.start()
                     self.process.start()
                     
@@ -3643,14 +5574,18 @@ class TemplateGeneration(BaseTemplate):
                     tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' requires all the following sheets: {', '.join(TEMPLATE_SHEET)}")
                     return
                 
-                if(not all([checkColumns(_data.columns, TEMPLATE_COLUMN) for _data in data.values()])):
+                if((frames := self.load_sheets(sheets[::-1], data)) is None): # the first sheet goes last so it stays parsed for the view
+                    if(not self.stop_flag): tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' could not be loaded")
+                    return
+                
+                if(not all([checkColumns(_data.columns, TEMPLATE_COLUMN) for _data in frames.values()])):
                     tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' requires all the following columns in all sheets: {', '.join(TEMPLATE_COLUMN)}")
                     return
                 
                 BaseTemplate.data = data
                 GUI_Handler.setOptions(sheets,self.sheetList,self.sheet)
                 self.set_after_upload_state()
-                GUI_Handler.view_excel(BaseTemplate.data[sheets[0]],self.text_excel)
+                GUI_Handler.view_excel(self.load_sheet(sheets[0]),self.text_excel)
                 
                 tkmb.showinfo('Upload Status',f"Excel File '{self.file.get()}' was loaded")
             else:
@@ -3702,16 +5637,22 @@ class TemplateGeneration(BaseTemplate):
                     tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' requires all the following sheets: {', '.join(TEMPLATE_SHEET)}")
                     return
                 
-                if(not all([checkColumns(_data.columns, TEMPLATE_COLUMN) for _data in data.values()])):
+                if((frames := self.load_sheets(sheets[::-1], data)) is None): # the first sheet goes last so it stays parsed for the view
+                    if(not self.stop_flag): tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' could not be loaded")
+                    return
+                
+                if(not all([checkColumns(_data.columns, TEMPLATE_COLUMN) for _data in frames.values()])):
                     tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' requires all the following columns in all sheets: {', '.join(TEMPLATE_COLUMN)}")
                     return
                     
                 BaseTemplate.data = data
                 GUI_Handler.setOptions(sheets,self.sheetList,self.sheet)
                 self.set_after_upload_state()
-                GUI_Handler.view_excel(data[sheets[0]],self.text_excel)
+                GUI_Handler.view_excel(self.load_sheet(sheets[0]),self.text_excel)
                 
                 self.prev_password = self.password_box.get()
+                
+                DecryptionCache.keep(Path(self.file.get()), self.prev_password, data)
                 tkmb.showinfo('Upload Status',f"Excel File '{self.file.get()}' was loaded")
             else:
                 
@@ -3733,7 +5674,7 @@ class TemplateGeneration(BaseTemplate):
                 
             if(self.can_start_thread()):
                 self.thread = Thread(target=self.load_protected_data_thread,daemon=True)
-                self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index},daemon=True)
+                self.process = Process(target=Decryption.fetch_encrypted_file,kwargs={'queue': self.QUEUE,'file_path': Path(file_path),'password':password,'skip':self.row_index,'decrypted_bytes': DecryptionCache.recall(Path(file_path), password)},daemon=True)
                 self.thread.start()
                 self.process.start()
             
@@ -3747,7 +5688,7 @@ class TemplateGeneration(BaseTemplate):
     def change_view_thread(self):
         GUI_Handler.lock_gui_button(self.to_disable)
         current_sheet = self.sheet.get()
-        current_data = BaseTemplate.data[current_sheet]
+        current_data = self.load_sheet(current_sheet)
         
         GUI_Handler.view_excel(current_data,self.text_excel)
         GUI_Handler.unlock_gui_button(self.to_disable)
@@ -3771,13 +5712,14 @@ class TemplateGeneration(BaseTemplate):
         if((current_sheet is not None) and (data is not None)):
             BaseTemplate.data = data
             self.set_after_upload_state()
-            GUI_Handler.view_excel(data[current_sheet],self.text_excel)
+            GUI_Handler.view_excel(self.load_sheet(current_sheet),self.text_excel)
             self.prev_password = self.password_box.get()
+            DecryptionCache.keep(Path(self.file.get()), self.prev_password, data)
         else:
             
             tkmb.showwarning('File Status',f"Excel File '{self.file.get()}' could not be loaded. Please check the password")
         
-        GUI_Handler.view_excel(BaseTemplate.data[self.sheet.get()],self.text_excel)
+        GUI_Handler.view_excel(self.load_sheet(self.sheet.get()),self.text_excel)
         GUI_Handler.unlock_gui_button(self.to_disable)    
         GUI_Handler.remove_widget(self.quit)
         
@@ -62,13 +62,62 @@ def cleanData(val:str|int|float) -> str:
     return str(val).replace('"',"'")
 
 
-def mapping(pd_columns: Iterable[str], columns:str) -> str | None:
-    column = columns.lower()
+class ColumnIndex:
+    """ Column names normalized and indexed once, resolves the shortest column containing a query """
+    
+    LIMIT = 32
+    """ Most indexes kept around by ColumnIndex.of """
+    
+    _indexes: dict[tuple[str, ...], 'ColumnIndex'] = {}
+    
+    def __init__(self, pd_columns: Iterable[str]) -> None:
+        self.columns = sorted(pd_columns, key=lambda i: len(str(i)))
+        self.names = [self.normalize(i) for i in self.columns]
+        self.grams: dict[str, set[int]] = {}
+        self.memo: dict[str, str | None] = {}
+        
+        for position, name in enumerate(self.names):
+            for gram in self.trigrams(name):
+                self.grams.setdefault(gram, set()).add(position)
+    
+    @staticmethod
+    def normalize(name: Any) -> str:
+        """ Drops newlines, collapses whitespace and case folds """
+        return " ".join(str(name).replace('\n', '').split()).casefold()
+    
+    @staticmethod
+    def trigrams(name: str) -> set[str]:
+        return {name[i:i+3] for i in range(len(name) - 2)}
+    
+    @staticmethod
+    def of(pd_columns: Iterable[str]) -> 'ColumnIndex':
+        """ Index of these columns, reused while the same columns keep being asked about """
+        key = tuple(pd_columns)
+        
+        if((index := ColumnIndex._indexes.get(key)) is None):
+            if(len(ColumnIndex._indexes) >= ColumnIndex.LIMIT): ColumnIndex._indexes.clear()
+            index = ColumnIndex._indexes[key] = ColumnIndex(key)
+        
+        return index
     
-    for i in sorted(pd_columns, key=len): 
-        if(column in i.lower()): return i
+    def find(self, columns: str) -> str | None:
+        column = self.normalize(columns)
+        
+        if(column in self.memo): return self.memo[column]
+        
+        candidates: Iterable[int] = range(len(self.names))
         
-    return None
+        if(len(column) >= 3):
+            postings = sorted((self.grams.get(gram, set()) for gram in self.trigrams(column)), key=len)
+            candidates = sorted(set.intersection(*postings)) if postings[0] else []
+        
+        found = next((self.columns[i] for i in candidates if column in self.names[i]), None)
+        self.memo[column] = found
+        
+        return found
+
+def mapping(pd_columns: Iterable[str], columns:str) -> str | None:
+    return ColumnIndex.of(pd_columns).find(columns)
 
 def check_column(col:str, pd_Data:pd.DataFrame) -> NullStr:
     pred_col = mapping(pd_Data.columns, col)
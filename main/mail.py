@@ -151,17 +151,19 @@ class AsyncMailing:
     
         
     async def sendMail(self, toAddr: str, msg:MIMEMultipart) -> bool:
-        """ Sends email asynchronously """
+        """ Sends email asynchronously, returns whether this message went out (a failed send does not fail the ones sharing the connection) """
+        sent = False
+        
         if self.status and self.smtp:
             try:
                 msg["From"] = self.email
                 await self.smtp.sendmail(self.email, toAddr, msg.as_string())
                 self.add_smtp_info(f"Email to ({toAddr}) was sent successfully")
+                sent = True
             except Exception as e:
                 self.add_smtp_error(self.error.get_error_info(e))
-                self.status = False
                 
-        return self.status
+        return sent
 
     def add_smtp_error(self, msg: str) -> None:
         self.error.write_error(msg, "ASYNC-SMTP")
@@ -191,12 +193,21 @@ class AsyncMessage:
         """ Attaches files to email """
         if self.status:
             try:
-                with open(file.resolve(), "rb") as attachment:
-                    part = MIMEBase("application", "octet-stream")
-                    part.set_payload(attachment.read())
-                    encoders.encode_base64(part)
-                    part.add_header("Content-Disposition", f"attachment; filename={filename}")
-                    self.msg.attach(part)
+                return self.addAttachBytes(file.resolve().read_bytes(), filename)
+            except Exception as e:
+                self.add_mime_error(self.error.get_error_info(e))
+                self.status = False
+        return self
+
+    def addAttachBytes(self, data: bytes, filename: str) -> 'AsyncMessage':
+        """ Attaches in-memory files to email """
+        if self.status:
+            try:
+                part = MIMEBase("application", "octet-stream")
+                part.set_payload(data)
+                encoders.encode_base64(part)
+                part.add_header("Content-Disposition", f"attachment; filename={filename}")
+                self.msg.attach(part)
             except Exception as e:
                 self.add_mime_error(self.error.get_error_info(e))
                 self.status = False
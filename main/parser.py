@@ -1,4 +1,5 @@
-import re
+import re, marshal, hashlib, hmac
+from importlib.util import MAGIC_NUMBER
 from json import loads, dumps
 from pathlib import Path
 import os
@@ -6,6 +7,82 @@ from type import *
 from default import DEFAULT_HTML, DEFAULT_NON_TEACHING_JSON, DEFAULT_SVV_HTML, DEFAULT_SVV_JSON, DEFAULT_TEACHING_JSON, DEFAULT_TEMPLATE, SVV_TEMPLATE
 from logger import Logger
 import pandas as pd
+import numpy as np
+
+def install_key(key_file: Path) -> bytes:
+	""" Random key of this install, made on first use, signs the files that get loaded back so a planted one is never run """
+	if(not key_file.exists()):
+		os.makedirs(key_file.parent, exist_ok=True)
+		partial = key_file.with_suffix(f".{os.getpid()}.part")
+		partial.write_bytes(os.urandom(32))
+		os.chmod(partial, 0o600)
+
+		try:
+			os.link(partial, key_file) # the first process to link wins, the others read its key
+		except FileExistsError:
+			pass
+		finally:
+			partial.unlink(missing_ok=True)
+
+	return key_file.read_bytes()
+
+class CompiledTemplate:
+	""" A template split once into literal segments and the slots between them """
+	__slots__ = ("layout", "slots", "keys", "fields", "code", "render_row")
+
+	def __init__(self, parts: list[str]) -> None:
+		""" parts alternates literal text and placeholder keys, as re.split with one group returns """
+		self.layout: tuple[str, ...] = tuple(part if i % 2 == 0 else "" for i, part in enumerate(parts))
+		self.slots: tuple[tuple[int, str], ...] = tuple((i, part) for i, part in enumerate(parts) if i % 2)
+		self.keys: frozenset[str] = frozenset(key for _, key in self.slots)
+		self.fields: tuple[str, ...] = tuple(dict.fromkeys(key for _, key in self.slots))
+		""" Placeholders in the order render_row takes them """
+		self.code: Optional[bytes] = None
+		""" Marshalled code of render_row, what a pickled template is bound again from """
+		self.render_row: Optional[Callable[[tuple[str, ...]], str]] = None
+
+	def __getstate__(self) -> dict[str, Any]:
+		""" render_row is made by exec and cannot be pickled, a worker process binds it again on first use """
+		return {name: getattr(self, name) for name in self.__slots__ if name != "render_row"}
+
+	def __setstate__(self, state: dict[str, Any]) -> None:
+		for name, value in state.items():
+			setattr(self, name, value)
+
+		self.render_row = None
+
+	def source(self) -> str:
+		""" Python source of a function that joins a row tuple of strings, ordered like fields, into the html """
+		position = {key: i for i, key in enumerate(self.fields)}
+		slots = dict(self.slots)
+		parts = [f"row[{position[slots[i]]}]" if i % 2 else repr(part) for i, part in enumerate(self.layout) if (i % 2 or part)] or ["''"]
+
+		return f"def render_row(row):\n\treturn ''.join(({', '.join(parts)},))\n"
+
+	def bind(self, code: Any) -> 'CompiledTemplate':
+		""" Runs the compiled source of this template and keeps its render_row """
+		namespace: dict[str, Any] = {}
+		exec(code, namespace)
+		self.code = marshal.dumps(code)
+		self.render_row = namespace["render_row"]
+
+		return self
+
+	def render(self, memo: dict[str, str]) -> str:
+		html = list(self.layout)
+
+		for i, key in self.slots:
+			html[i] = str(memo.get(key))
+
+		return "".join(html)
+
+	def render_columns(self, values: dict[str, list[str]], rows: int) -> list[str]:
+		""" Renders rows from the values of each placeholder, one without values reads None like render """
+		columns = [values[key] if key in values else ["None"] * rows for key in self.fields]
+
+		if(self.render_row is None): self.bind(marshal.loads(self.code) if self.code else compile(self.source(), "<template>", "exec"))
+
+		return list(map(self.render_row, zip(*columns))) if columns else [self.layout[0]] * rows # type: ignore
 
 
 class PDFTemplate:
@@ -15,8 +92,12 @@ class PDFTemplate:
 		self.json_path =  Path(dir_path, "json")
 		self.html_path = Path(dir_path, "html")
 		self.excel_path = Path(dir_path, "excel")
+		self.layout_path = Path(dir_path, "layout")
 		self.chosen_json: Optional[Path] = None
 		self.chosen_html: Optional[Path] = None
+		self.compiled: dict[Path, tuple[float, CompiledTemplate]] = {}
+		self.code_path = Path(dir_path, "compiled")
+		self.key_file = Path(dir_path, "snapshots", ".key")
 		self.log = log
 
 	def _load_defaults(self, path: Path, fileType: Literal['json', 'html'], **kwargs: str) -> tuple[bool, str]:
@@ -72,8 +153,39 @@ class PDFTemplate:
 		self._load_template(Path("teaching.xlsx"), DEFAULT_TEMPLATE)
 		self._load_template(Path("svv.xlsx"), SVV_TEMPLATE)
 
+		self._load_defaults(
+			path=self.layout_path,
+			fileType='json',
+			teaching = dumps(self.make_layout(DEFAULT_TEMPLATE)),
+			svv = dumps(self.make_layout(SVV_TEMPLATE))
+		)
+
 		return self
 
+	@staticmethod
+	def make_layout(template: dict[str, dict[str, list[str]]]) -> dict[str, list[list[str]]]:
+		""" Label and json key of every row per section, numbered the way the html template is """
+		layout: dict[str, list[list[str]]] = {}
+		count = 0
+
+		for sheet, sheetData in template.items():
+			rows = dict(zip(sheetData.get("Name", []), sheetData.get("Column", [])))
+			layout[sheet.strip().replace(" ","_")] = [[str(label), str(count + i)] for i, label in enumerate(rows)]
+			count += len(rows)
+
+		return layout
+
+	def load_layout(self, html_file: Path) -> dict[str, list[list[str]]]:
+		""" Section layout saved alongside a generated template, empty for hand written html """
+		try:
+			if( (text := self.load_file(self.layout_path, Path(html_file).with_suffix(".json"))) is not None):
+				return loads(text)
+
+		except Exception as e:
+			self.log.write_error(self.log.get_error_info(e), "PARSE")
+
+		return {}
+
 	def _read_excel_to_dict(self, file: Path) -> None:
 		""" Prints out the memo and writes it into a local json """
 		memo: dict[str, dict[str, list[str]]] = {}	
@@ -112,10 +224,10 @@ class PDFTemplate:
 		msg = f"File Created: {file_name}"
         
 		try:
-			if(( path := str(file_name.parent) ) in [str(self.html_path), str(self.json_path)]):
+			if(( path := str(file_name.parent) ) in [str(self.html_path), str(self.json_path), str(self.layout_path)]):
 				os.makedirs(path)
 			else:
-				return status, f"File path must be within these paths only: {str(self.html_path)}, {str(self.json_path)}"
+				return status, f"File path must be within these paths only: {str(self.html_path)}, {str(self.json_path)}, {str(self.layout_path)}"
 	
 		except Exception as e:
 			self.log.write_error(self.log.get_error_info(e), "PARSE")
@@ -192,12 +304,98 @@ class PDFTemplate:
     
 		return None
 
-	def render_html(self, html_file: Path, memo:dict[str,str]) -> str:
-		
-		""" preprocess the keys to escape % """
-		memo = {i.replace('%',f"%%"):j for i,j in memo.items()}
+	def compile_html(self, file_path: Path) -> CompiledTemplate:
+		""" Parses a template once and reuses it until the file changes on disk """
+		file_name = Path(self.html_path, file_path)
 
-		html, vars = self.load_html(html_file)
-		vars.update(memo)
-	
-		return html % vars
+		try:
+			if(not file_name.exists()):
+				return CompiledTemplate([""])
+
+			mtime = file_name.stat().st_mtime
+
+			if((cached := self.compiled.get(file_name)) is None or cached[0] != mtime):
+				text = file_name.read_text().strip(" \n")
+				template = CompiledTemplate(re.split(self.TEMPLATE, text))
+				self.compiled[file_name] = cached = (mtime, template.bind(self.load_code(text, template)))
+
+			return cached[1]
+
+		except Exception as e:
+			self.log.write_error(self.log.get_error_info(e), "PARSE")
+
+		return CompiledTemplate([""])
+
+	def _sign(self, data: bytes) -> bytes:
+		return hmac.new(install_key(self.key_file), data, hashlib.sha256).digest()
+
+	def load_code(self, text: str, template: CompiledTemplate) -> Any:
+		""" Code object of the template's render_row, kept on disk by template hash and signed with the install key so later runs skip code generation """
+		code_file = Path(self.code_path, f"{hashlib.sha256(text.encode()).hexdigest()}.bin")
+
+		try:
+			if(code_file.exists()):
+				data = code_file.read_bytes()
+
+				if(hmac.compare_digest(data[:32], self._sign(data[32:])) and data[32:].startswith(MAGIC_NUMBER)):
+					return marshal.loads(data[32+len(MAGIC_NUMBER):])
+
+				code_file.unlink(missing_ok=True)
+				self.log.write_info(f"Compiled template '{code_file.name}' failed its signature check and was removed", "PARSE")
+		except Exception as e:
+			self.log.write_error(self.log.get_error_info(e), "PARSE")
+
+		code = compile(template.source(), f"<{code_file.stem}>", "exec")
+
+		try:
+			os.makedirs(self.code_path, exist_ok=True)
+			partial = code_file.with_suffix(f".{os.getpid()}.part")
+			data = MAGIC_NUMBER + marshal.dumps(code)
+			partial.write_bytes(self._sign(data) + data)
+			os.replace(partial, code_file) # shard processes may race to write the same template
+		except Exception as e:
+			self.log.write_error(self.log.get_error_info(e), "PARSE")
+
+		return code
+
+	def validate(self, html_file: Path, json_file: Path, resolve: Callable[[str], NullStr], provided: Iterable[str] = ()) -> TEMPLATE_REPORT:
+		""" Cross checks the placeholders of the html, the entries of the json and the columns resolve can find, a missing or unreadable file is an error """
+		errors: list[str] = []
+		memo: dict = {}
+
+		if(self.load_file(self.html_path, html_file) is None):
+			errors.append(f"Template '{html_file}' is missing or could not be read")
+
+		if((text := self.load_file(self.json_path, json_file)) is None):
+			errors.append(f"Mapping '{json_file}' is missing or could not be read")
+		else:
+			try:
+				memo = loads(text)
+			except ValueError as e:
+				errors.append(f"Mapping '{json_file}' is not valid json: {e}")
+
+			if(not isinstance(memo, dict)):
+				errors.append(f"Mapping '{json_file}' does not map placeholders to columns")
+				memo = {}
+
+		keys = self.compile_html(html_file).keys if not errors else []
+		provided = set(provided)
+
+		report: TEMPLATE_REPORT = {
+			"errors": errors,
+			"unmapped": sorted(key for key in keys if key not in memo and key not in provided),
+			"unused": sorted(key for key in memo if key not in keys),
+			"missing_columns": {key: column for key, column in memo.items() if key in keys and resolve(column) is None},
+			"ok": False
+		}
+		report["ok"] = not (report["errors"] or report["unmapped"] or report["missing_columns"])
+
+		return report
+
+	def render_columns(self, html_file: Path, values: dict[str, list[str]], rows: int) -> list[str]:
+		""" Html of rows whose values were already projected, a list of every row for each placeholder """
+		return self.compile_html(html_file).render_columns(values, rows)
+
+	def render_html(self, html_file: Path, memo:dict[str,str]) -> str:
+		""" Fills the compiled template, placeholders missing from memo read None """
+		return self.compile_html(html_file).render(memo)
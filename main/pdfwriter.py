@@ -0,0 +1,431 @@
+import io, re
+import pydyf # type: ignore
+from struct import pack
+from type import *
+
+PX_TO_PT = 0.75
+""" css pixels are 1/96 inch, pdf points are 1/72 inch """
+
+STANDARD_FONTS = {
+    'Helvetica': ('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Helvetica-BoldOblique'),
+    'Times': ('Times-Roman', 'Times-Bold', 'Times-Italic', 'Times-BoldItalic'),
+    'Courier': ('Courier', 'Courier-Bold', 'Courier-Oblique', 'Courier-BoldOblique'),
+}
+""" Fonts every pdf reader has, as (regular, bold, italic, bold italic) of each family """
+
+FAMILIES = {
+    'Helvetica': {'sans-serif', 'helvetica', 'arial', 'calibri', 'carlito', 'verdana', 'tahoma', 'segoe ui', 'ubuntu', 'roboto', 'open sans', 'liberation sans', 'dejavu sans', 'noto sans', 'trebuchet ms', 'system-ui'},
+    'Times': {'serif', 'times', 'times new roman', 'georgia', 'cambria', 'garamond', 'book antiqua', 'palatino', 'liberation serif', 'dejavu serif', 'noto serif'},
+    'Courier': {'monospace', 'courier', 'courier new', 'consolas', 'monaco', 'lucida console', 'liberation mono', 'dejavu sans mono', 'noto sans mono'},
+}
+""" css font families drawn with each standard family, the nearest in shape and width """
+
+def standard_font(families: Iterable[str], bold: bool = False, italic: bool = False) -> str:
+    """ Standard font closest to a css font-family list, the first family it knows wins like a browser falling back """
+
+    for family in families:
+        for standard, names in FAMILIES.items():
+            if(str(family).strip('"\' ').casefold() in names):
+                return STANDARD_FONTS[standard][bold + 2 * italic]
+
+    raise ValueError(f"Font '{', '.join(families)}' has no standard pdf font to draw values with")
+
+def pdf_text(text: str) -> bytes:
+    """ Escapes text into a pdf literal string for the standard WinAnsi fonts """
+    raw = str(text).replace('\r', '').replace('\n', ' ').encode('cp1252', 'replace')
+    return b'(' + raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+def append_update(base: bytes, objects: dict[int, bytes]) -> bytes:
+    """ Appends an incremental update to a finished pdf that replaces the given objects """
+
+    start = base.rindex(b'startxref')
+    prev = int(base[start:].split()[1])
+    trailer = base[prev:]
+    size = int(re.search(rb'/Size (\d+)', trailer).group(1)) # type: ignore
+    root = re.search(rb'/Root (\d+ \d+ R)', trailer).group(1) # type: ignore
+
+    body = bytearray(base)
+    if(not body.endswith(b'\n')): body += b'\n'
+    offsets: dict[int, int] = {}
+
+    for number, data in sorted(objects.items()):
+        offsets[number] = len(body)
+        body += b'%d 0 obj\n' % number + data + b'\nendobj\n'
+
+    xref_offset = len(body)
+
+    if(base[prev:prev+4] == b'xref'):
+        body += b'xref\n'
+        for number, offset in offsets.items():
+            body += b'%d 1\n%010d 00000 n \n' % (number, offset)
+        body += b'trailer\n<< /Size %d /Root %s /Prev %d >>\n' % (size, root, prev)
+    else:
+        # the base uses a cross-reference stream, so the update has to use one too
+        offsets[size] = xref_offset
+        index = b' '.join(b'%d 1' % number for number in offsets)
+        rows = b''.join(pack('>BIH', 1, offset, 0) for offset in offsets.values())
+        body += b'%d 0 obj\n<< /Type /XRef /Size %d /Root %s /Prev %d /Index [%s] /W [1 4 2] /Length %d >>\nstream\n' % (size, size + 1, root, prev, index, len(rows))
+        body += rows + b'\nendstream\nendobj\n'
+
+    body += b'startxref\n%d\n%%%%EOF\n' % xref_offset
+
+    return bytes(body)
+
+
+class OverlayTemplate:
+    """ A slip laid out once with hidden sample values, every employee only redraws the values on top.
+    Values are drawn in the standard pdf font (Helvetica, Times or Courier) nearest to the font of their cell, a template whose fonts have none is refused """
+
+    SLOT = "__slot_{0}__"
+
+    def __init__(self, document: Any, keys: list[str], zoom: float = 1) -> None:
+        self.keys = keys
+        self.scale = zoom * PX_TO_PT
+        self.slots: list[tuple[int, str, float, float, float, str, tuple[float, float, float], str, float, float]] = []
+        """ (page, key, anchor, baseline, size, font, color, align, left, right) of every slot, left and right bound the cell it sits in """
+        self.fonts: dict[str, str] = {}
+        """ resource name of every standard font the slots use """
+        self.overlays: dict[int, int] = {}
+        self._locate(document)
+        self.skeleton: bytes = document.write_pdf(zoom=zoom, finisher=self._prepare)
+
+    @staticmethod
+    def mark(html: str, pattern: str, sample: dict[str, str]) -> tuple[str, list[str]]:
+        """ Swaps every placeholder for a hidden span with a sample value, so the layout keeps its room """
+
+        keys: list[str] = []
+
+        def slot(match: re.Match) -> str:
+            keys.append(match.group(1))
+            return f'<span id="{OverlayTemplate.SLOT.format(len(keys) - 1)}" style="visibility: hidden">{sample.get(match.group(1), "")}</span>'
+
+        return re.sub(pattern, slot, html), keys
+
+    @staticmethod
+    def _walk(box: Any, block: Any) -> Iterator[tuple[Any, Any]]:
+        """ Every box under box alongside the block it is laid out in """
+
+        from weasyprint.formatting_structure import boxes # type: ignore
+
+        if(isinstance(box, boxes.BlockContainerBox)): block = box
+
+        yield box, block
+
+        for child in getattr(box, 'children', []):
+            yield from OverlayTemplate._walk(child, block)
+
+    @staticmethod
+    def _align(style: Any) -> str:
+        """ left, right or center, whichever css text-align the block asks for """
+
+        try:
+            align = style['text_align_all']
+        except KeyError:
+            align = style['text_align']
+
+        rtl = style['direction'] == 'rtl'
+
+        return {'start': 'right' if rtl else 'left', 'end': 'left' if rtl else 'right', 'justify': 'left'}.get(align, align)
+
+    def _locate(self, document: Any) -> None:
+        """ Finds the baseline, font, alignment and cell bounds of every hidden slot """
+
+        from weasyprint.formatting_structure import boxes # type: ignore
+
+        seen: set[str] = set()
+
+        for page_number, page in enumerate(document.pages):
+            for box, block in self._walk(page._page_box, page._page_box):
+                if(not isinstance(box, boxes.InlineBox) or box.element is None): continue
+
+                slot_id = box.element.get('id') or ''
+
+                if(not slot_id.startswith('__slot_') or slot_id in seen): continue
+                seen.add(slot_id)
+
+                style = box.style
+                color = style['color']
+                baseline = box.position_y + getattr(box, 'baseline', style['font_size'])
+                align = self._align(block.style)
+                left, right = box.content_box_x(), box.content_box_x() + box.width
+                cell_left, cell_right = block.content_box_x(), block.content_box_x() + block.width
+
+                # the sample is the widest value, so its span marks where the text of the cell ends
+                anchor = {'right': right, 'center': (left + right) / 2}.get(align, left)
+
+                self.slots.append((
+                    page_number,
+                    self.keys[int(slot_id[len('__slot_'):-2])],
+                    anchor * self.scale,
+                    page.height * self.scale - baseline * self.scale,
+                    style['font_size'] * self.scale,
+                    standard_font(style['font_family'], style['font_weight'] >= 600, style['font_style'] != 'normal'),
+                    (color.red, color.green, color.blue),
+                    align,
+                    min(cell_left, left) * self.scale,
+                    max(cell_right, right) * self.scale
+                ))
+
+    def _resolve(self, pdf: Any, value: Any) -> Any:
+        """ Follows an indirect reference to its object """
+
+        if(isinstance(value, str)): value = value.encode()
+
+        if(isinstance(value, bytes) and (found := re.fullmatch(rb'(\d+) \d+ R', value))):
+            return pdf.objects[int(found.group(1))]
+
+        return value
+
+    def _prepare(self, document: Any, pdf: Any) -> None:
+        """ Gives every page with slots an empty overlay stream and the fonts it needs """
+
+        fonts = {}
+
+        for number, base in enumerate(sorted({slot[5] for slot in self.slots})):
+            font = pydyf.Dictionary({'Type': '/Font', 'Subtype': '/Type1', 'BaseFont': f'/{base}', 'Encoding': '/WinAnsiEncoding'})
+            pdf.add_object(font)
+            self.fonts[base] = f'SlipFont{number}'
+            fonts[self.fonts[base]] = font.reference
+
+        pages = [i for i in pdf.objects if isinstance(i, dict) and i.get('Type') == '/Page']
+
+        for page_number in sorted({slot[0] for slot in self.slots}):
+            page = pages[page_number]
+
+            resources = pydyf.Dictionary(self._resolve(pdf, page.get('Resources')) or {})
+            page_fonts = pydyf.Dictionary(self._resolve(pdf, resources.get('Font')) or {})
+            page_fonts.update(fonts)
+            resources['Font'] = page_fonts
+            page['Resources'] = resources
+
+            save, restore, overlay = pydyf.Stream([b'q']), pydyf.Stream([b'Q']), pydyf.Stream([])
+            for stream in (save, restore, overlay): pdf.add_object(stream)
+
+            contents = page['Contents'] if isinstance(page['Contents'], list) else [page['Contents']]
+            page['Contents'] = pydyf.Array([save.reference, *contents, restore.reference, overlay.reference])
+            self.overlays[page_number] = overlay.number
+
+    def render(self, values: dict[str, str]) -> bytes:
+        """ Draws the values of one employee over the skeleton, shrunk to fit and clipped to their cell """
+
+        streams = {page_number: pydyf.Stream() for page_number in self.overlays}
+
+        for page_number, key, anchor, y, size, font, color, align, left, right in self.slots:
+            value = str(values.get(key))
+
+            if(align == 'right'): room = anchor - left
+            elif(align == 'center'): room = 2 * min(anchor - left, right - anchor)
+            else: room = right - anchor
+
+            if((natural := text_width(value, size, font=font)) > room > 0):
+                size = max(5, size * room / natural)
+                natural = text_width(value, size, font=font)
+
+            if(align == 'right'): x = anchor - natural
+            elif(align == 'center'): x = anchor - natural / 2
+            else: x = anchor
+
+            stream = streams[page_number]
+            stream.push_state()
+            stream.rectangle(left, y - size, right - left, 3 * size)
+            stream.clip()
+            stream.end()
+            stream.begin_text()
+            stream.set_color_rgb(*color)
+            stream.set_font_size(self.fonts[font], size)
+            stream.text_matrix(1, 0, 0, 1, x, y)
+            stream.stream.append(pdf_text(value) + b' Tj')
+            stream.end_text()
+            stream.pop_state()
+
+        objects: dict[int, bytes] = {}
+
+        for page_number, stream in streams.items():
+            objects[self.overlays[page_number]] = stream.data
+
+        return append_update(self.skeleton, objects)
+
+
+def text_width(text: str, size: float, bold: bool = False, font: NullStr = None) -> float:
+    """ Rough advance width of text in a standard font, Helvetica unless font names another """
+
+    if(font is not None):
+        bold = 'Bold' in font
+
+        if(font.startswith('Courier')): return len(text) * 0.6 * size
+
+    width = 0.0
+
+    for char in text:
+        if(char in "iljI.,:;'|!() "): width += 0.28
+        elif(char in "mwMW@%"): width += 0.85
+        elif(char.isupper() or char in "&#"): width += 0.68
+        else: width += 0.54
+
+    return width * size * (1.06 if bold else 1) * (0.9 if (font or '').startswith('Times') else 1)
+
+def wrap_text(text: str, width: float, size: float, bold: bool = False) -> list[str]:
+    """ Breaks text into lines that fit the width, a single long word keeps its own line """
+
+    lines: list[str] = []
+    line = ""
+
+    for word in str(text).split():
+        candidate = f"{line} {word}".strip()
+
+        if(line and text_width(candidate, size, bold) > width):
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+
+    return lines + [line] if line else lines or [""]
+
+
+class SlipWriter:
+    """ Draws the standard slip sections straight to pdf, the frame is built once and every employee only adds the values """
+
+    PAGE = (595.28, 841.89)
+    MARGIN = 36.0
+    SIZE = 9.0
+    LEADING = 11.0
+    PADDING = 5.0
+    LABEL_SHARE = 0.5
+    """ Part of a column given to the labels, the values get the rest """
+
+    HEADING = ("SOMAIYA VIDYAVIHAR", "K J SOMAIYA INSTITUTE OF TECHNOLOGY, SION", "SOMAIYA AYURVIHAR SION MUMBAI SION 400022 MAHARASHTRA INDIA")
+    PERIOD = "Payslip for the month of {month} {year}"
+    FOOTER = "This is a computer-generated salary slip, hence signature is not required."
+
+    BOXES: list[tuple[Optional[str], str, str, NullStr, NullStr]] = [
+        (None, "Personal_Left", "Personal_Right", None, None),
+        ("Earnings and Deductions", "Earning", "Deductions", "Earnings", "Deductions"),
+        (None, "Salary_Left", "Salary_Right", None, None),
+    ]
+    """ Boxes drawn top to bottom as (title, left section, right section, left heading, right heading) """
+
+    FONTS = {False: 'SlipRegular', True: 'SlipBold'}
+
+    def __init__(self, layout: dict[str, list[list[str]]]) -> None:
+        self.frames: list[bytearray] = [bytearray()]
+        self.slots: list[tuple[int, float, float, float, bool, Callable[[dict[str, str]], str]]] = []
+        """ (page, x, baseline, room, centered, text) of every value """
+        self._compose(layout)
+        self.frames_data = [bytes(frame) for frame in self.frames]
+
+    def _text(self, x: float, y: float, text: str, size: float, bold: bool = False) -> bytes:
+        return b'BT /%s %.2f Tf %.2f %.2f Td %s Tj ET\n' % (self.FONTS[bold].encode(), size, x, y, pdf_text(text))
+
+    def _centered(self, y: float, text: str, size: float, bold: bool = False) -> None:
+        self.frames[-1] += self._text((self.PAGE[0] - text_width(text, size, bold)) / 2, y, text, size, bold)
+
+    def _column(self, x: float, top: float, width: float, heading: NullStr, rows: list[list[str]], draw: bool) -> float:
+        """ Lays out one half of a box, returns its height """
+
+        y = top - self.PADDING
+        label_width = width * self.LABEL_SHARE - 2 * self.PADDING
+        value_x = x + width * self.LABEL_SHARE
+
+        if(heading is not None):
+            y -= self.LEADING
+            if(draw): self.frames[-1] += self._text(x + self.PADDING, y + 2, heading, self.SIZE, True)
+
+        for label, key in rows:
+            lines = wrap_text(f"{label}:", label_width, self.SIZE)
+            y -= self.LEADING
+
+            if(draw):
+                for offset, line in enumerate(lines):
+                    self.frames[-1] += self._text(x + self.PADDING, y + 2 - offset * self.LEADING, line, self.SIZE)
+
+                self.slots.append((len(self.frames) - 1, value_x, y + 2, width - width * self.LABEL_SHARE - self.PADDING, False, lambda values, key=key: str(values.get(key, ""))))
+
+            y -= self.LEADING * (len(lines) - 1) + self.PADDING
+
+        return top - y
+
+    def _compose(self, layout: dict[str, list[list[str]]]) -> None:
+        """ Draws everything that does not change between employees and remembers where the values go """
+
+        width = self.PAGE[0] - 2 * self.MARGIN
+        half = width / 2
+        y = self.PAGE[1] - self.MARGIN
+
+        for number, line in enumerate(self.HEADING):
+            size = 13 if number == 0 else 9.5
+            y -= size + 3
+            self._centered(y, line, size, number == 0)
+
+        y -= 20
+        self.slots.append((0, 0, y, width, True, lambda values: self.PERIOD.format(month=values.get("month", ""), year=values.get("year", ""))))
+        y -= 8
+
+        for title, left, right, left_heading, right_heading in self.BOXES:
+            if(not layout.get(left) and not layout.get(right)): continue
+
+            height = max(
+                self._column(self.MARGIN, y, half, left_heading, layout.get(left, []), False),
+                self._column(self.MARGIN + half, y, half, right_heading, layout.get(right, []), False),
+            ) + (22 if title else 0) + 10
+
+            if(y - height < self.MARGIN):
+                self.frames.append(bytearray())
+                y = self.PAGE[1] - self.MARGIN
+
+            if(title is not None):
+                y -= 14
+                self._centered(y, title, 10, True)
+                y -= 8
+
+            box = max(
+                self._column(self.MARGIN, y, half, left_heading, layout.get(left, []), True),
+                self._column(self.MARGIN + half, y, half, right_heading, layout.get(right, []), True),
+            )
+
+            self.frames[-1] += b'0.8 w %.2f %.2f %.2f %.2f re S\n' % (self.MARGIN, y - box, width, box)
+            y -= box + 10
+
+        self._centered(max(y - 14, self.MARGIN), self.FOOTER, 8)
+
+    def render(self, values: dict[str, str]) -> bytes:
+        """ Writes one slip with the values of one employee """
+
+        pdf = pydyf.PDF()
+        fonts = pydyf.Dictionary()
+
+        for bold, name in self.FONTS.items():
+            font = pydyf.Dictionary({'Type': '/Font', 'Subtype': '/Type1', 'BaseFont': '/Helvetica-Bold' if bold else '/Helvetica', 'Encoding': '/WinAnsiEncoding'})
+            pdf.add_object(font)
+            fonts[name] = font.reference
+
+        pages = [bytearray(frame) for frame in self.frames_data]
+
+        for page_number, x, y, width, centered, text in self.slots:
+            value = text(values)
+            size = self.SIZE
+
+            if(centered):
+                size = 10
+                x = (self.PAGE[0] - text_width(value, size)) / 2
+            elif((natural := text_width(value, size)) > width):
+                size = max(5, size * width / natural)
+
+            pages[page_number] += self._text(x, y, value, size)
+
+        resources = pydyf.Dictionary({'Font': fonts})
+
+        for data in pages:
+            stream = pydyf.Stream([bytes(data)])
+            pdf.add_object(stream)
+            pdf.add_page(pydyf.Dictionary({
+                'Type': '/Page',
+                'Parent': pdf.pages.reference,
+                'MediaBox': pydyf.Array([0, 0, *self.PAGE]),
+                'Contents': stream.reference,
+                'Resources': resources,
+            }))
+
+        output = io.BytesIO()
+        pdf.write(output)
+
+        return output.getvalue()
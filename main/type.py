@@ -11,6 +11,21 @@ class DB_CRED(TypedDict):
     password: str
     database: str
 
+class PROGRESS(TypedDict):
+    shard: int
+    completed: int
+    failed: int
+    total: int
+    rate: float
+    eta: float
+
+class TEMPLATE_REPORT(TypedDict):
+    errors: list[str]
+    unmapped: list[str]
+    unused: list[str]
+    missing_columns: dict[str, str]
+    ok: bool
+
 type NullStr = str | None
 type NullInt = str | None
 